@@ -51,6 +51,18 @@ class ADBCommands:
     UI_DUMP_COMPRESSED: ClassVar[str] = (
         "adb -s {device} shell uiautomator dump --compressed"
     )
+    # Stream the dump back over the adb pipe without writing to sdcard.
+    UI_DUMP_STREAM: ClassVar[str] = (
+        "adb -s {device} exec-out uiautomator dump /dev/tty"
+    )
+    UI_DUMP_STREAM_COMPRESSED: ClassVar[str] = (
+        "adb -s {device} exec-out uiautomator dump --compressed /dev/tty"
+    )
+    # exec-out streams raw bytes; ``shell cat`` goes through a PTY that
+    # rewrites line endings.
+    UI_DUMP_FETCH: ClassVar[str] = (
+        "adb -s {device} exec-out cat /sdcard/window_dump.xml"
+    )
 
     TAP: ClassVar[str] = "adb -s {device} shell input tap {x} {y}"
     SWIPE: ClassVar[str] = (
@@ -3,7 +3,11 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from itertools import repeat
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
 
 from .ui_models import parse_bounds
 
@@ -12,6 +16,214 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Seconds a fetched layout is reused by back-to-back lookups on one device.
+_LAYOUT_CACHE_TTL = 0.25
+
+# State bits packed into _LayoutSnapshot.flags.
+_CLICKABLE = 1
+_ENABLED = 2
+_SCROLLABLE = 4
+
+# Keys every element_to_dict result carries, with their fallback values.
+_ELEMENT_DEFAULTS: Dict[str, str] = {
+    "text": "",
+    "resource-id": "",
+    "class": "",
+    "content-desc": "",
+    "bounds": "[0,0][0,0]",
+    "clickable": "false",
+    "enabled": "false",
+    "focusable": "false",
+    "scrollable": "false",
+    "displayed": "true",
+}
+
+
+def _lower(value: Optional[str]) -> Optional[str]:
+    """Lowercase a search needle, passing ``None`` through."""
+    return value.lower() if value is not None else None
+
+
+def _base_score(element: Dict[str, Any]) -> int:
+    """Score the query-independent factors used by ``find_best_element``."""
+    get = element.get
+    score = 0
+
+    # Interaction capability
+    if get("clickable", "false") == "true":
+        score += 3
+    if get("enabled", "false") == "true":
+        score += 2
+
+    # Element quality indicators
+    if get("resource-id", ""):
+        score += 1
+
+    # Size bonus for larger elements (likely more important)
+    bounds = parse_bounds(get("bounds", "[0,0][0,0]"))
+    if bounds:
+        width: int = bounds["right"] - bounds["left"]
+        height: int = bounds["bottom"] - bounds["top"]
+        if width > 100 and height > 100:
+            score += 1
+
+    return score
+
+
+def _required_flags(
+    clickable_only: bool, enabled_only: bool, scrollable_only: bool
+) -> int:
+    """Pack the requested state filters into a flags mask."""
+    return (
+        (_CLICKABLE if clickable_only else 0)
+        | (_ENABLED if enabled_only else 0)
+        | (_SCROLLABLE if scrollable_only else 0)
+    )
+
+
+@dataclass
+class _LayoutSnapshot:
+    """A cached layout plus lookup structures derived from it on demand.
+
+    The state-flag, base-score and lowercased string columns run parallel
+    to the layout's element list, so filters and scoring read plain lists
+    instead of hashing into (and re-parsing bounds from) every element dict
+    on each query. Building a column costs about as much as one direct scan,
+    so the finder only uses them once a snapshot serves a second query; a
+    one-shot lookup scans the elements directly. Index buckets keep document
+    order, so narrowed lookups return matches in the same order as a full
+    scan. Query results are memoized for the snapshot's lifetime.
+    """
+
+    fetched_at: float
+    layout: Dict[str, Any]
+    # Set by the first query; later ones use the derived columns
+    queried: bool = False
+    # Query tuple -> result, for find_elements and find_best_element
+    found: Dict[Tuple[Any, ...], List[Dict[str, Any]]] = field(default_factory=dict)
+    best: Dict[Tuple[Any, ...], Optional[Dict[str, Any]]] = field(
+        default_factory=dict
+    )
+
+    @cached_property
+    def by_resource_id(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Elements bucketed by exact resource ID."""
+        index: Dict[str, List[Dict[str, Any]]] = {}
+        for element in self.layout["elements"]:
+            index.setdefault(element.get("resource-id", ""), []).append(element)
+        return index
+
+    @cached_property
+    def by_class(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Elements bucketed by exact class name."""
+        index: Dict[str, List[Dict[str, Any]]] = {}
+        for element in self.layout["elements"]:
+            index.setdefault(element.get("class", ""), []).append(element)
+        return index
+
+    @cached_property
+    def flags(self) -> List[int]:
+        """Packed state bits, with the same defaults as the row matcher."""
+        return [
+            (_CLICKABLE if e.get("clickable", "false") == "true" else 0)
+            | (_ENABLED if e.get("enabled", "true") == "true" else 0)
+            | (_SCROLLABLE if e.get("scrollable", "false") == "true" else 0)
+            for e in self.layout["elements"]
+        ]
+
+    def exact_candidates(
+        self, resource_id: Optional[str], class_name: Optional[str]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Return the index bucket for an exact lookup, or ``None``."""
+        if resource_id is not None:
+            return self.by_resource_id.get(resource_id, [])
+        if class_name is not None:
+            return self.by_class.get(class_name, [])
+        return None
+
+    @cached_property
+    def base_score(self) -> List[int]:
+        """Query-independent score of each element (parses bounds)."""
+        return [_base_score(e) for e in self.layout["elements"]]
+
+    @cached_property
+    def resource_ids(self) -> List[str]:
+        """Resource IDs as-is (partial ID matching is case-sensitive)."""
+        return [e.get("resource-id", "") for e in self.layout["elements"]]
+
+    @cached_property
+    def classes_lower(self) -> List[str]:
+        """Lowercased class names."""
+        return [e.get("class", "").lower() for e in self.layout["elements"]]
+
+    @cached_property
+    def content_descs_lower(self) -> List[str]:
+        """Lowercased content descriptions."""
+        return [e.get("content-desc", "").lower() for e in self.layout["elements"]]
+
+    @cached_property
+    def texts_lower(self) -> List[str]:
+        """Lowercased element texts."""
+        return [e.get("text", "").lower() for e in self.layout["elements"]]
+
+    def partial_matches(
+        self,
+        text: Optional[str],
+        resource_id: Optional[str],
+        class_name: Optional[str],
+        content_desc: Optional[str],
+        clickable_only: bool,
+        enabled_only: bool,
+        scrollable_only: bool,
+        first_only: bool,
+    ) -> List[Dict[str, Any]]:
+        """Return elements matching the criteria with partial string matching.
+
+        Mirrors :meth:`ElementFinder._element_matches_criteria` for
+        ``exact_match=False``; ``text``, ``class_name`` and ``content_desc``
+        must already be lowercased.
+        """
+        elements = self.layout["elements"]
+        required = _required_flags(clickable_only, enabled_only, scrollable_only)
+        # Only touch (and build) the columns the query needs; an empty
+        # needle means the criterion is unset and its column stays None.
+        id_needle: str = resource_id or ""
+        class_needle: str = class_name or ""
+        desc_needle: str = content_desc or ""
+        text_needle: str = text or ""
+        resource_ids = self.resource_ids if id_needle else None
+        classes = self.classes_lower if class_needle else None
+        descs = self.content_descs_lower if desc_needle else None
+        texts = self.texts_lower if text_needle else None
+
+        matches: List[Dict[str, Any]] = []
+        for i, flags in enumerate(self.flags):
+            if flags & required != required:
+                continue
+            if resource_ids is not None and id_needle not in resource_ids[i]:
+                continue
+            if classes is not None and class_needle not in classes[i]:
+                continue
+            if descs is not None and desc_needle not in descs[i]:
+                continue
+            if texts is not None and text_needle not in texts[i]:
+                continue
+            matches.append(elements[i])
+            if first_only:
+                break
+        return matches
+
+    def state_candidates(
+        self, clickable_only: bool, enabled_only: bool, scrollable_only: bool
+    ) -> List[Dict[str, Any]]:
+        """Return the elements that pass the requested state filters."""
+        required = _required_flags(clickable_only, enabled_only, scrollable_only)
+        return [
+            element
+            for element, flags in zip(self.layout["elements"], self.flags)
+            if flags & required == required
+        ]
+
 
 class ElementFinder:
     """Find UI elements by various criteria."""
@@ -23,6 +235,48 @@ class ElementFinder:
             ui_extractor: UILayoutExtractor instance for getting UI layout.
         """
         self.ui_extractor = ui_extractor
+        self._layout_ttl: float = _LAYOUT_CACHE_TTL
+        # device_id -> snapshot of the last successful get_ui_layout result
+        self._layout_cache: Dict[str, _LayoutSnapshot] = {}
+
+    async def _get_layout_cached(self, device_id: str) -> Dict[str, Any]:
+        """Return the device's UI layout, reusing one fetched moments ago.
+
+        Several lookups against the same frame then share a single
+        uiautomator dump. Failed dumps are never cached.
+        """
+        now = time.monotonic()
+        cached = self._layout_cache.get(device_id)
+        if cached and now - cached.fetched_at < self._layout_ttl:
+            return cached.layout
+
+        layout_result = await self.ui_extractor.get_ui_layout(device_id=device_id)
+        if layout_result.get("success"):
+            self._layout_cache[device_id] = _LayoutSnapshot(now, layout_result)
+        return layout_result
+
+    def _snapshot_for(
+        self, device_id: str, layout_result: Dict[str, Any]
+    ) -> _LayoutSnapshot:
+        """Return the snapshot of a successful ``layout_result``.
+
+        Normally the one cached by :meth:`_get_layout_cached`; if that has
+        since been dropped, an uncached snapshot is built instead.
+        """
+        cached = self._layout_cache.get(device_id)
+        if cached is None or cached.layout is not layout_result:
+            return _LayoutSnapshot(time.monotonic(), layout_result)
+        return cached
+
+    def invalidate_layout_cache(self, device_id: Optional[str] = None) -> None:
+        """Drop the cached layout for ``device_id`` (or all devices).
+
+        Call after an action that changes the screen, such as a tap.
+        """
+        if device_id is None:
+            self._layout_cache.clear()
+        else:
+            self._layout_cache.pop(device_id, None)
 
     async def find_elements(
         self,
@@ -36,14 +290,16 @@ class ElementFinder:
         exact_match: bool = False,
         *,
         device_id: str,
+        first_only: bool = False,
     ) -> List[Dict[str, Any]]:
         """Find elements matching criteria.
 
-        Returns list of matching UIElement objects.
+        Returns list of matching UIElement objects. With ``first_only`` the
+        search stops at the first match, returning at most one element.
         """
         try:
             # Get current UI layout
-            layout_result = await self.ui_extractor.get_ui_layout(device_id=device_id)
+            layout_result = await self._get_layout_cached(device_id)
             if not layout_result["success"]:
                 # Return empty immediately if we can't get the UI layout
                 return []
@@ -54,11 +310,9 @@ class ElementFinder:
             if not elements:
                 return []
 
-            matches: List[Dict[str, Any]] = []
-
-            self._find_in_elements_recursive(
-                elements,
-                matches,
+            # Repeated identical queries against one snapshot reuse the result
+            snapshot = self._snapshot_for(device_id, layout_result)
+            query = (
                 text,
                 resource_id,
                 class_name,
@@ -67,19 +321,22 @@ class ElementFinder:
                 enabled_only,
                 scrollable_only,
                 exact_match,
+                first_only,
             )
-
-            # Elements are already dictionaries, return them directly
-            return matches
+            matches = snapshot.found.get(query)
+            if matches is None:
+                matches = snapshot.found[query] = self._match_snapshot(
+                    snapshot, *query
+                )
+            return list(matches)
 
         except Exception as e:
             logger.error(f"Element finding failed: {e}")
             return []
 
-    def _find_in_elements_recursive(
+    def _match_snapshot(
         self,
-        elements: List[Dict[str, Any]],
-        matches: List[Dict[str, Any]],
+        snapshot: _LayoutSnapshot,
         text: Optional[str],
         resource_id: Optional[str],
         class_name: Optional[str],
@@ -88,9 +345,47 @@ class ElementFinder:
         enabled_only: bool,
         scrollable_only: bool,
         exact_match: bool,
-    ) -> None:
-        """Recursively search through element tree."""
-        for element in elements:
+        first_only: bool,
+    ) -> List[Dict[str, Any]]:
+        """Return the snapshot's elements matching the criteria, in order."""
+        if not exact_match:
+            text, class_name, content_desc = (
+                _lower(text),
+                _lower(class_name),
+                _lower(content_desc),
+            )
+        elements = snapshot.layout["elements"]
+        reused, snapshot.queried = snapshot.queried, True
+
+        if reused and not exact_match:
+            # Partial matching runs over the snapshot's lowercased columns
+            return snapshot.partial_matches(
+                text,
+                resource_id,
+                class_name,
+                content_desc,
+                clickable_only,
+                enabled_only,
+                scrollable_only,
+                first_only,
+            )
+        if reused:
+            # Narrow the exact scan using the snapshot: id/class lookups only
+            # need one index bucket, otherwise the state flags pre-filter.
+            candidates = snapshot.exact_candidates(resource_id, class_name)
+            if candidates is not None:
+                elements = candidates
+            elif clickable_only or enabled_only or scrollable_only:
+                elements = snapshot.state_candidates(
+                    clickable_only, enabled_only, scrollable_only
+                )
+                # Already applied; don't re-check them per element
+                clickable_only = enabled_only = scrollable_only = False
+
+        # Elements are already dictionaries, return them directly
+        matching = (
+            element
+            for element in elements
             if self._element_matches_criteria(
                 element,
                 text,
@@ -101,11 +396,13 @@ class ElementFinder:
                 enabled_only,
                 scrollable_only,
                 exact_match,
-            ):
-                matches.append(element)
-
-            # For dictionary elements, children are not nested in the same way
-            # They're all in the flat elements list, so no need to recurse through children
+            )
+        )
+        if first_only:
+            # Stop at the first hit instead of checking the rest
+            first = next(matching, None)
+            return [first] if first is not None else []
+        return list(matching)
 
     def _element_matches_criteria(
         self,
@@ -119,54 +416,44 @@ class ElementFinder:
         scrollable_only: bool,
         exact_match: bool,
     ) -> bool:
-        """Check if element matches all specified criteria."""
+        """Check if element matches all specified criteria.
+
+        Unless ``exact_match`` is set, ``text``, ``class_name`` and
+        ``content_desc`` must already be lowercased by the caller.
+        """
+        get = element.get  # bound once; called up to seven times below
+
         # Filter by clickable/enabled/scrollable state
-        if clickable_only and element.get("clickable", "false") != "true":
+        if clickable_only and get("clickable", "false") != "true":
             return False
-        if enabled_only and element.get("enabled", "true") != "true":
+        if enabled_only and get("enabled", "true") != "true":
             return False
-        if scrollable_only and element.get("scrollable", "false") != "true":
+        if scrollable_only and get("scrollable", "false") != "true":
             return False
 
-        # Text matching
-        if text is not None:
-            element_text = element.get("text", "")
-            if exact_match:
-                if element_text != text:
-                    return False
-            else:
-                if text.lower() not in element_text.lower():
-                    return False
-
-        # Resource ID matching
-        if resource_id is not None:
-            element_resource_id = element.get("resource-id", "")
-            if exact_match:
-                if element_resource_id != resource_id:
-                    return False
-            else:
-                if resource_id not in element_resource_id:
-                    return False
-
-        # Class name matching
-        if class_name is not None:
-            element_class = element.get("class", "")
-            if exact_match:
-                if element_class != class_name:
-                    return False
-            else:
-                if class_name.lower() not in element_class.lower():
-                    return False
-
-        # Content description matching
-        if content_desc is not None:
-            element_content_desc = element.get("content-desc", "")
-            if exact_match:
-                if element_content_desc != content_desc:
-                    return False
-            else:
-                if content_desc.lower() not in element_content_desc.lower():
-                    return False
+        # String criteria, most selective first: resource IDs are near-unique,
+        # while text is usually the longest string to scan.
+        if exact_match:
+            if resource_id is not None and get("resource-id", "") != resource_id:
+                return False
+            if class_name is not None and get("class", "") != class_name:
+                return False
+            if content_desc is not None and get("content-desc", "") != content_desc:
+                return False
+            if text is not None and get("text", "") != text:
+                return False
+            return True
+
+        # Partial matching; an empty needle matches everything, so it is
+        # skipped before lowercasing the element's value.
+        if resource_id and resource_id not in get("resource-id", ""):
+            return False
+        if class_name and class_name not in get("class", "").lower():
+            return False
+        if content_desc and content_desc not in get("content-desc", "").lower():
+            return False
+        if text and text not in get("text", "").lower():
+            return False
 
         return True
 
@@ -185,16 +472,13 @@ class ElementFinder:
         """
         try:
             # Get raw UIElement objects for scoring
-            layout_result = await self.ui_extractor.get_ui_layout(device_id=device_id)
+            layout_result = await self._get_layout_cached(device_id)
             if not layout_result["success"]:
                 return None
 
-            elements = layout_result["elements"]
-            raw_matches: List[Dict[str, Any]] = []
-
-            self._find_in_elements_recursive(
-                elements,
-                raw_matches,
+            # Repeated identical queries against one snapshot reuse the result
+            snapshot = self._snapshot_for(device_id, layout_result)
+            query = (
                 text,
                 criteria.get("resource_id"),
                 criteria.get("class_name"),
@@ -204,51 +488,79 @@ class ElementFinder:
                 criteria.get("scrollable_only", False),
                 criteria.get("exact_match", False),
             )
-
-            if not raw_matches:
-                return None
-
-            scored_matches: List[Tuple[int, Dict[str, Any]]] = []
-            for element in raw_matches:
-                score: int = 0
-
-                # Text matching score
-                element_text = element.get("text", "")
-                if text and element_text:
-                    if element_text.lower() == text.lower():
-                        score += 10
-                    elif text.lower() in element_text.lower():
-                        score += 5
-
-                # Interaction capability
-                if element.get("clickable", "false") == "true":
-                    score += 3
-                if element.get("enabled", "false") == "true":
-                    score += 2
-
-                # Element quality indicators
-                if element.get("resource-id", ""):
-                    score += 1
-
-                # Size bonus for larger elements (likely more important)
-                bounds_str = element.get("bounds", "[0,0][0,0]")
-                bounds = parse_bounds(bounds_str)
-                if bounds:
-                    width: int = bounds["right"] - bounds["left"]
-                    height: int = bounds["bottom"] - bounds["top"]
-                    if width > 100 and height > 100:
-                        score += 1
-
-                scored_matches.append((score, element))
-
-            # Return highest scoring element (already a dict)
-            scored_matches.sort(key=lambda x: x[0], reverse=True)
-            return scored_matches[0][1]
+            if query not in snapshot.best:
+                snapshot.best[query] = self._best_in_snapshot(snapshot, *query)
+            return snapshot.best[query]
 
         except Exception as e:
             logger.error(f"Best element finding failed: {e}")
             return None
 
+    def _best_in_snapshot(
+        self,
+        snapshot: _LayoutSnapshot,
+        text: Optional[str],
+        resource_id: Optional[str],
+        class_name: Optional[str],
+        content_desc: Optional[str],
+        clickable_only: bool,
+        enabled_only: bool,
+        scrollable_only: bool,
+        exact_match: bool,
+    ) -> Optional[Dict[str, Any]]:
+        """Return the highest-scoring matching element of the snapshot."""
+        # Matcher needles, pre-lowered for partial matching
+        if exact_match:
+            match_text, match_class, match_desc = text, class_name, content_desc
+        else:
+            match_text = _lower(text)
+            match_class = _lower(class_name)
+            match_desc = _lower(content_desc)
+        text_lower = text.lower() if text else None
+
+        # A one-shot query only scores its matches; a reused snapshot
+        # shares the precomputed column.
+        reused, snapshot.queried = snapshot.queried, True
+        base_scores: Iterable[Optional[int]] = (
+            snapshot.base_score if reused else repeat(None)
+        )
+
+        # Filter, score and keep the best in a single pass; ties go to
+        # the earliest element.
+        best_element: Optional[Dict[str, Any]] = None
+        best_score = -1
+        elements = snapshot.layout["elements"]
+        for element, base_score in zip(elements, base_scores):
+            if not self._element_matches_criteria(
+                element,
+                match_text,
+                resource_id,
+                match_class,
+                match_desc,
+                clickable_only,
+                enabled_only,
+                scrollable_only,
+                exact_match,
+            ):
+                continue
+
+            # Text matching score on top of the query-independent factors
+            score: int = base_score if base_score is not None else _base_score(element)
+            element_text = element.get("text", "")
+            if text_lower and element_text:
+                element_text_lower = element_text.lower()
+                if element_text_lower == text_lower:
+                    score += 10
+                elif text_lower in element_text_lower:
+                    score += 5
+
+            if score > best_score:
+                best_score = score
+                best_element = element
+
+        # Highest scoring element (already a dict), or None
+        return best_element
+
     async def find_element_by_text(
         self, text: str, exact_match: bool = False, *, device_id: str
     ) -> Optional[Dict[str, Any]]:
@@ -264,7 +576,7 @@ class ElementFinder:
         """
         try:
             elements = await self.find_elements(
-                text=text, exact_match=exact_match, device_id=device_id
+                text=text, exact_match=exact_match, device_id=device_id, first_only=True
             )
             return elements[0] if elements else None
         except Exception as e:
@@ -285,7 +597,10 @@ class ElementFinder:
         """
         try:
             elements = await self.find_elements(
-                resource_id=resource_id, exact_match=True, device_id=device_id
+                resource_id=resource_id,
+                exact_match=True,
+                device_id=device_id,
+                first_only=True,
             )
             return elements[0] if elements else None
         except Exception as e:
@@ -326,25 +641,5 @@ class ElementFinder:
 
     def element_to_dict(self, element: Dict[str, Any]) -> Dict[str, Any]:
         """Convert element to dictionary representation (elements are already dicts)."""
-        # Elements are already dictionaries, but ensure all expected keys are present
-        result = dict(element)  # Copy the original dict
-
-        # Ensure all expected keys exist with default values
-        expected_keys = {
-            "text": "",
-            "resource-id": "",
-            "class": "",
-            "content-desc": "",
-            "bounds": "[0,0][0,0]",
-            "clickable": "false",
-            "enabled": "false",
-            "focusable": "false",
-            "scrollable": "false",
-            "displayed": "true",
-        }
-
-        for key, default_value in expected_keys.items():
-            if key not in result:
-                result[key] = default_value
-
-        return result
+        # Copy the element, filling any missing expected keys with defaults
+        return {**_ELEMENT_DEFAULTS, **element}
@@ -29,6 +29,13 @@ from .path_safety import safe_join
 
 logger = logging.getLogger(__name__)
 
+# Standard logcat line: MM-DD HH:MM:SS[.mmm] PID TID LEVEL TAG : MESSAGE.
+# Compiled once; this runs for every line a monitor or logcat call reads.
+_LOGCAT_LINE_RE = re.compile(
+    r"(\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}(?:\.\d{3})?)\s+(\d+)\s+(\d+)\s+"
+    r"([VDIWEF])\s+([^:]+):\s*(.*)"
+)
+
 
 # Type definitions for better type safety
 class LogcatResult(TypedDict, total=False):
@@ -438,16 +445,10 @@ class LogMonitor:
 
         Standard format: MM-DD HH:MM:SS.mmm PID TID LEVEL TAG : MESSAGE
         """
-        # Regex pattern for standard logcat format
-        pattern = r"(\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\.\d{3})\s+(\d+)\s+(\d+)\s+([VDIWEF])\s+([^:]+):\s*(.*)"
-
-        match = re.match(pattern, line)
+        # Milliseconds are optional; older devices omit them.
+        match = _LOGCAT_LINE_RE.match(line)
         if not match:
-            # Try alternative format without milliseconds
-            alt_pattern = r"(\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\s+(\d+)\s+(\d+)\s+([VDIWEF])\s+([^:]+):\s*(.*)"
-            match = re.match(alt_pattern, line)
-            if not match:
-                return None
+            return None
 
         try:
             timestamp_str, pid_str, tid_str, level_str, tag, message = match.groups()
@@ -45,6 +45,19 @@ class ScreenAutomation:
         self.ui_inspector = ui_inspector
         self.element_finder = ElementFinder(ui_inspector)
 
+    async def _execute_action(self, command: str, *, device_id: str) -> Dict[str, Any]:
+        """Run a screen-changing ADB command, then drop the cached layout.
+
+        Every tap, swipe, key and text action goes through here so element
+        lookups never see the screen as it was before the action.
+        """
+        try:
+            return await self.adb_manager.execute_adb_command(
+                command, device_id=device_id
+            )
+        finally:
+            self.element_finder.invalidate_layout_cache(device_id)
+
     # -- Tap / long-press -------------------------------------------------
 
     async def tap_coordinates(
@@ -53,9 +66,7 @@ class ScreenAutomation:
         """Execute tap at specific coordinates."""
         try:
             command = ADBCommands.TAP.format(device="{device}", x=x, y=y)
-            result = await self.adb_manager.execute_adb_command(
-                command, device_id=device_id
-            )
+            result = await self._execute_action(command, device_id=device_id)
 
             return {
                 "success": result["success"],
@@ -216,9 +227,7 @@ class ScreenAutomation:
             command = ADBCommands.SWIPE.format(
                 device="{device}", x1=x, y1=y, x2=x, y2=y, duration=duration_ms
             )
-            result = await self.adb_manager.execute_adb_command(
-                command, device_id=device_id
-            )
+            result = await self._execute_action(command, device_id=device_id)
 
             return {
                 "success": result["success"],
@@ -262,9 +271,7 @@ class ScreenAutomation:
                 y2=end_y,
                 duration=duration_ms,
             )
-            result = await self.adb_manager.execute_adb_command(
-                command, device_id=device_id
-            )
+            result = await self._execute_action(command, device_id=device_id)
 
             return {
                 "success": result["success"],
@@ -380,8 +387,13 @@ class ScreenAutomation:
                     "error": "UI inspector required for element scrolling",
                 }
 
-            # Find scrollable element
-            finder = ElementFinder(inspector)
+            # Find scrollable element, sharing our finder's layout cache
+            # when it reads from the same inspector
+            finder = (
+                self.element_finder
+                if inspector is self.ui_inspector
+                else ElementFinder(inspector)
+            )
             elements = await finder.find_elements(
                 scrollable_only=True, device_id=device_id, **element_criteria
             )
@@ -469,7 +481,7 @@ class ScreenAutomation:
                     logger.warning(f"Failed to clear text field: {clear_result}")
 
             # Check for Unicode characters
-            has_unicode = any(ord(char) > 127 for char in text)
+            has_unicode = not text.isascii()
             warnings = []
 
             if has_unicode:
@@ -485,9 +497,7 @@ class ScreenAutomation:
             command = ADBCommands.TEXT_INPUT.format(
                 device="{device}", text=shlex.quote(device_escaped)
             )
-            result = await self.adb_manager.execute_adb_command(
-                command, device_id=device_id
-            )
+            result = await self._execute_action(command, device_id=device_id)
 
             # Submit text if requested and input was successful
             submitted = False
@@ -555,9 +565,7 @@ class ScreenAutomation:
             command = ADBCommands.KEY_EVENT.format(
                 device="{device}", keycode=actual_keycode
             )
-            result = await self.adb_manager.execute_adb_command(
-                command, device_id=device_id
-            )
+            result = await self._execute_action(command, device_id=device_id)
 
             return {
                 "success": result["success"],
@@ -593,9 +601,7 @@ class ScreenAutomation:
             max_dels = 256
             keycodes = ["KEYCODE_MOVE_END"] + ["KEYCODE_DEL"] * max_dels
             command = "adb -s {device} shell input keyevent " + " ".join(keycodes)
-            result = await self.adb_manager.execute_adb_command(
-                command, device_id=device_id
-            )
+            result = await self._execute_action(command, device_id=device_id)
 
             return {
                 "success": result["success"],
@@ -2,7 +2,10 @@
 
 import asyncio
 import logging
-from typing import Any, Dict, Optional
+import re
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..decorators import mcp_error_boundary, timeout_wrapper
 from ..element_finder import ElementFinder
@@ -14,39 +17,47 @@ from ..validation import create_validation_error_response, log_validation_attemp
 
 logger = logging.getLogger(__name__)
 
+# Package names identifying Chrome/Chromium foreground apps
+# (e.g. com.android.chrome, com.chrome.beta, org.chromium.chrome).
+_CHROME_PACKAGE_RE = re.compile(r"chrome|org\.chromium", re.IGNORECASE)
+
+# Seconds a foreground-app Chrome check stays valid for a device.
+_FOREGROUND_CACHE_TTL = 2.0
+
+# device_id -> (monotonic timestamp, is_chrome)
+_fg_cache: Dict[str, Tuple[float, bool]] = {}
+
+# Boolean attributes copied onto screen elements only when "true".
+_SCREEN_FLAG_KEYS = ("clickable", "enabled", "focusable", "scrollable")
+
 
 def _transform_element_to_screen_format(
     element: Dict[str, Any],
 ) -> Optional[Dict[str, Any]]:
     """Transform Android MCP element format to mobile-next compatible format."""
     try:
+        get = element.get
+
         # Parse bounds from "[x1,y1][x2,y2]" to coordinates
-        bounds_str = element.get("bounds", "[0,0][0,0]")
-        coordinates = _parse_bounds_to_coordinates(bounds_str)
+        coordinates = _parse_bounds_to_coordinates(get("bounds", "[0,0][0,0]"))
 
         if not coordinates:
             return None
 
-        # Transform to mobile-next format
+        # Transform to mobile-next format. Class names come from a small
+        # vocabulary, so intern them to share one string per class.
         screen_element = {
-            "type": element.get("class", ""),
-            "text": element.get("text", ""),
-            "label": element.get("content-desc", ""),  # content-desc becomes label
-            "identifier": element.get(
-                "resource-id", ""
-            ),  # resource-id becomes identifier
+            "type": sys.intern(get("class") or ""),
+            "text": get("text", ""),
+            "label": get("content-desc", ""),  # content-desc becomes label
+            "identifier": get("resource-id", ""),  # resource-id becomes identifier
             "coordinates": coordinates,
         }
 
         # Add optional properties if present
-        if element.get("clickable") == "true":
-            screen_element["clickable"] = True
-        if element.get("enabled") == "true":
-            screen_element["enabled"] = True
-        if element.get("focusable") == "true":
-            screen_element["focusable"] = True
-        if element.get("scrollable") == "true":
-            screen_element["scrollable"] = True
+        for key in _SCREEN_FLAG_KEYS:
+            if get(key) == "true":
+                screen_element[key] = True
 
         return screen_element
 
@@ -80,19 +91,80 @@ def _is_meaningful_element(element: Dict[str, Any]) -> bool:
     if coords.get("width", 0) <= 0 or coords.get("height", 0) <= 0:
         return False
 
-    has_content = bool(
+    # Interactivity flags are plain booleans set by the transform, so test
+    # them before paying for any string stripping.
+    if (
+        element.get("clickable")
+        or element.get("focusable")
+        or element.get("scrollable")
+    ):
+        return True
+
+    return bool(
         element.get("text", "").strip()
         or element.get("label", "").strip()
         or element.get("identifier", "").strip()
     )
 
-    is_interactive = bool(
-        element.get("clickable")
-        or element.get("focusable")
-        or element.get("scrollable")
-    )
 
-    return has_content or is_interactive
+def _shared_finder(ui_inspector: Any) -> ElementFinder:
+    """Return the long-lived ElementFinder for ``ui_inspector``.
+
+    Reuses ``screen_automation.element_finder`` so lookups share its layout
+    cache, which screen actions invalidate; a fresh finder is only built
+    when no matching one is registered.
+    """
+    screen_automation = ComponentRegistry.instance().get("screen_automation")
+    finder = getattr(screen_automation, "element_finder", None)
+    if finder is not None and getattr(finder, "ui_extractor", None) is ui_inspector:
+        return finder
+    return ElementFinder(ui_inspector)
+
+
+def _as_dict_elements(
+    elements: List[Any],
+    ui_inspector: Any,
+    finder: Optional[ElementFinder] = None,
+) -> List[Any]:
+    """Return ``elements`` as JSON-ready dicts.
+
+    Dumps are homogeneous, so the first element decides: dict lists are
+    returned as-is, and an ElementFinder is only looked up (when the caller
+    has none) if a conversion is actually needed.
+    """
+    if not elements or isinstance(elements[0], dict):
+        return elements
+    if finder is None:
+        finder = _shared_finder(ui_inspector)
+    return [finder.element_to_dict(e) for e in elements]
+
+
+def _transform_and_check(element: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Transform an element and keep it only if it is meaningful."""
+    transformed = _transform_element_to_screen_format(element)
+    if transformed and _is_meaningful_element(transformed):
+        return transformed
+    return None
+
+
+async def _is_chrome_foreground(adb_manager: Any, device_id: str) -> bool:
+    """Return whether Chrome is in the foreground, cached briefly per device.
+
+    The foreground app does not flip between rapid successive calls, so a
+    short TTL saves an adb round-trip for agents that poll the screen.
+    """
+    now = time.monotonic()
+    cached = _fg_cache.get(device_id)
+    if cached and now - cached[0] < _FOREGROUND_CACHE_TTL:
+        return cached[1]
+
+    foreground_info = await adb_manager.get_foreground_app(device_id=device_id)
+    if not foreground_info.get("success"):
+        return False
+    pkg = foreground_info.get("package") or ""
+    is_chrome = _CHROME_PACKAGE_RE.search(pkg) is not None
+    _fg_cache[device_id] = (now, is_chrome)
+    return is_chrome
 
 
 @mcp_error_boundary()
@@ -114,8 +186,9 @@ async def get_ui_layout(params: UILayoutParams) -> Dict[str, Any]:
     - `get_ui_layout` → client-side filtering → `tap_screen`/`swipe_direction`.
     - `get_ui_layout` → `list_screen_elements` for LLM-friendly view.
     """
-    ui_inspector = ComponentRegistry.instance().get("ui_inspector")
-    adb_manager = ComponentRegistry.instance().get("adb_manager")
+    registry = ComponentRegistry.instance()
+    ui_inspector = registry.get("ui_inspector")
+    adb_manager = registry.get("adb_manager")
     if not ui_inspector or not adb_manager:
         return {
             "success": False,
@@ -132,16 +205,7 @@ async def get_ui_layout(params: UILayoutParams) -> Dict[str, Any]:
 
     # Convert elements to dict format for JSON serialization
     if result["success"] and "elements" in result:
-        finder = ElementFinder(ui_inspector)
-        converted_elements = []
-        for element in result["elements"]:
-            if isinstance(element, dict):
-                # Element is already a dict, use it as-is
-                converted_elements.append(element)
-            else:
-                # Element is a UIElement object, convert to dict
-                converted_elements.append(finder.element_to_dict(element))
-        result["elements"] = converted_elements
+        result["elements"] = _as_dict_elements(result["elements"], ui_inspector)
 
     return result
 
@@ -165,8 +229,9 @@ async def list_screen_elements() -> Dict[str, Any]:
       prefer `take_screenshot` for visual grounding and then use `tap_screen`/`swipe_direction`
       with coordinates derived from the screenshot.
     """
-    ui_inspector = ComponentRegistry.instance().get("ui_inspector")
-    adb_manager = ComponentRegistry.instance().get("adb_manager")
+    registry = ComponentRegistry.instance()
+    ui_inspector = registry.get("ui_inspector")
+    adb_manager = registry.get("adb_manager")
 
     if not ui_inspector or not adb_manager:
         return {
@@ -205,12 +270,7 @@ async def list_screen_elements() -> Dict[str, Any]:
     device_id = adb_manager.default_device_id()
 
     # Detect Chrome foreground and adjust behavior to avoid heavy dumps that may hang
-    is_chrome = False
-    foreground_info = await adb_manager.get_foreground_app(device_id=device_id)
-    if foreground_info.get("success"):
-        pkg = (foreground_info.get("package") or "").lower()
-        if any(k in pkg for k in ["chrome", "org.chromium", "com.android.chrome"]):
-            is_chrome = True
+    is_chrome = await _is_chrome_foreground(adb_manager, device_id)
 
     # Get all UI elements with tight timeout and no internal retries to avoid hanging
     try:
@@ -258,11 +318,9 @@ async def list_screen_elements() -> Dict[str, Any]:
     all_elements = layout_result.get("elements", [])
 
     # Filter and transform elements to LLM-friendly format
-    screen_elements = []
-    for element in all_elements:
-        transformed_element = _transform_element_to_screen_format(element)
-        if transformed_element and _is_meaningful_element(transformed_element):
-            screen_elements.append(transformed_element)
+    screen_elements = [
+        t for element in all_elements if (t := _transform_and_check(element))
+    ]
 
     return {
         "success": True,
@@ -276,11 +334,13 @@ async def list_screen_elements() -> Dict[str, Any]:
 @timeout_wrapper()
 async def find_elements(params: ElementSearchParams) -> Dict[str, Any]:
     """Find UI elements by various attributes."""
-    start_time = asyncio.get_event_loop().time()
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
 
-    ui_inspector = ComponentRegistry.instance().get("ui_inspector")
-    adb_manager = ComponentRegistry.instance().get("adb_manager")
-    validator = ComponentRegistry.instance().get("validator")
+    registry = ComponentRegistry.instance()
+    ui_inspector = registry.get("ui_inspector")
+    adb_manager = registry.get("adb_manager")
+    validator = registry.get("validator")
 
     if not ui_inspector or not validator or not adb_manager:
         return {
@@ -298,21 +358,24 @@ async def find_elements(params: ElementSearchParams) -> Dict[str, Any]:
         class_name=params.class_name,
     )
 
+    # Params are only dumped for logging, so skip the model walk when the
+    # record would be filtered out anyway.
     if not validation_result.is_valid:
-        log_validation_attempt(
-            "find_elements", params.model_dump(), validation_result, logger
-        )
+        if logger.isEnabledFor(logging.WARNING):
+            log_validation_attempt(
+                "find_elements", params.model_dump(), validation_result, logger
+            )
         return create_validation_error_response(validation_result, "element search")
 
     # Log validation warnings if any
-    if validation_result.warnings:
+    if validation_result.warnings and logger.isEnabledFor(logging.INFO):
         log_validation_attempt(
-            "find_elements", params.dict(), validation_result, logger
+            "find_elements", params.model_dump(), validation_result, logger
         )
 
     # Use sanitized parameters
     sanitized_params = validation_result.sanitized_value
-    finder = ElementFinder(ui_inspector)
+    finder = _shared_finder(ui_inspector)
 
     try:
         # Budget a portion of the remaining time for the search stage
@@ -330,7 +393,7 @@ async def find_elements(params: ElementSearchParams) -> Dict[str, Any]:
             )
     except (asyncio.TimeoutError, TimeoutError):
         # If the search times out, return empty result immediately
-        execution_time = asyncio.get_event_loop().time() - start_time
+        execution_time = loop.time() - start_time
         logger.info(
             f"Element search stage timed out (~{inner_timeout:.2f}s budget). "
             f"Returning empty result (total time: {execution_time:.2f}s)"
@@ -345,16 +408,9 @@ async def find_elements(params: ElementSearchParams) -> Dict[str, Any]:
         }
 
     # Convert elements to dict format for JSON serialization
-    converted_elements = []
-    for element in elements:
-        if isinstance(element, dict):
-            # Element is already a dict, use it as-is
-            converted_elements.append(element)
-        else:
-            # Element is a UIElement object, convert to dict
-            converted_elements.append(finder.element_to_dict(element))
-
-    execution_time = asyncio.get_event_loop().time() - start_time
+    converted_elements = _as_dict_elements(elements, ui_inspector, finder)
+
+    execution_time = loop.time() - start_time
 
     # Log performance for debugging
     if len(elements) == 0 and execution_time > 1.0:
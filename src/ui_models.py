@@ -1,15 +1,31 @@
 """Data models and utilities for UI inspection."""
 
 import logging
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Well-formed uiautomator bounds: "[l,t][r,b]".
+_BOUNDS_RE = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
 
-@dataclass
+# Maps "[l,t][r,b]" to "l,t,r,b," in a single pass.
+_BOUNDS_TABLE = str.maketrans({"[": "", "]": ","})
+
+
+@dataclass(eq=False, frozen=True, slots=True)
 class UIElement:
-    """Structured representation of UI element."""
+    """Structured representation of UI element.
+
+    Compared by identity: field-wise equality would recurse through
+    ``children`` and make membership checks on element lists quadratic.
+    Slotted and frozen so large dumps stay compact and parsed elements can
+    be shared safely; only the parser fills ``children`` while building.
+    ``xpath`` is derived on access from ``tag``/``index`` and the parent
+    chain rather than stored per element.
+    """
 
     class_name: str
     resource_id: Optional[str]
@@ -23,8 +39,21 @@ class UIElement:
     scrollable: bool
     displayed: bool
     children: List["UIElement"]
-    xpath: str
     index: int
+    tag: str = "node"
+    # Canonical "[l,t][r,b]" form of ``bounds``; empty when not known.
+    bounds_str: str = ""
+    parent: Optional["UIElement"] = field(default=None, repr=False)
+
+    @property
+    def xpath(self) -> str:
+        """Positional path from the root, e.g. ``/hierarchy[0]/node[2]``."""
+        steps = []
+        element: Optional[UIElement] = self
+        while element is not None:
+            steps.append(f"/{element.tag}[{element.index}]")
+            element = element.parent
+        return "".join(reversed(steps))
 
 
 def parse_bounds(bounds_str: str) -> Dict[str, int]:
@@ -33,12 +62,80 @@ def parse_bounds(bounds_str: str) -> Dict[str, int]:
     Returns dict with left, top, right, bottom keys.
     Returns zeroed dict on invalid input.
     """
+    left, top, right, bottom, _ = _parse_bounds_cached(bounds_str)
+    return {"left": left, "top": top, "right": right, "bottom": bottom}
+
+
+def parse_bounds_canonical(bounds_str: str) -> Tuple[Dict[str, int], str]:
+    """Parse bounds and also return them in canonical '[l,t][r,b]' form.
+
+    Well-formed input that needs no fix-ups is returned verbatim, so callers
+    that serialize bounds again do not have to format them.
+    """
+    left, top, right, bottom, canonical = _parse_bounds_cached(bounds_str)
+    return {"left": left, "top": top, "right": right, "bottom": bottom}, canonical
+
+
+# (left, top, right, bottom, canonical string)
+_BoundsRecord = Tuple[int, int, int, int, str]
+
+
+def _parse_bounds_cached(bounds_str: str) -> _BoundsRecord:
+    """Look up ``bounds_str`` in the parse cache, parsing it on a miss."""
+    try:
+        return _parse_bounds_record(bounds_str)
+    except TypeError:  # unhashable or non-string input
+        bounds = _parse_bounds_lenient(bounds_str)
+        return (
+            bounds["left"],
+            bounds["top"],
+            bounds["right"],
+            bounds["bottom"],
+            format_bounds(bounds),
+        )
+
+
+@lru_cache(maxsize=2048)
+def _parse_bounds_record(bounds_str: str) -> _BoundsRecord:
+    """Parse one distinct bounds string into an immutable record.
+
+    Dumps repeat the same bounds a lot (wrappers around a single child,
+    ``[0,0][0,0]`` placeholders), so results are cached per string.
+    """
+    canonical = None
+    match = _BOUNDS_RE.fullmatch(bounds_str) if bounds_str else None
+    if match is None:
+        bounds = _parse_bounds_lenient(bounds_str)
+    else:
+        left, top, right, bottom = map(int, match.groups())
+        if 0 <= left <= right and 0 <= top <= bottom:
+            canonical = bounds_str
+        bounds = _normalize_bounds(left, top, right, bottom, bounds_str)
+    return (
+        bounds["left"],
+        bounds["top"],
+        bounds["right"],
+        bounds["bottom"],
+        canonical or format_bounds(bounds),
+    )
+
+
+def format_bounds(bounds: Dict[str, int]) -> str:
+    """Format a bounds dict back into '[left,top][right,bottom]'."""
+    return (
+        f"[{bounds['left']},{bounds['top']}]"
+        f"[{bounds['right']},{bounds['bottom']}]"
+    )
+
+
+def _parse_bounds_lenient(bounds_str: str) -> Dict[str, int]:
+    """Slow path for bounds strings that are not exactly '[l,t][r,b]'."""
     try:
         if not bounds_str or bounds_str.strip() == "":
             logger.warning("Empty bounds string provided")
             return {"left": 0, "top": 0, "right": 0, "bottom": 0}
 
-        clean = bounds_str.replace("[", "").replace("]", ",")
+        clean = bounds_str.translate(_BOUNDS_TABLE)
         coords = [int(x) for x in clean.split(",") if x.strip()]
 
         if len(coords) != 4:
@@ -48,32 +145,34 @@ def parse_bounds(bounds_str: str) -> Dict[str, int]:
             return {"left": 0, "top": 0, "right": 0, "bottom": 0}
 
         left, top, right, bottom = coords
-
-        if left > right or top > bottom:
-            logger.warning(
-                f"Invalid bounds geometry: left={left}, top={top}, right={right}, bottom={bottom}"
-            )
-            if left > right:
-                left, right = right, left
-            if top > bottom:
-                top, bottom = bottom, top
-
-        if any(coord < 0 for coord in (left, top, right, bottom)):
-            logger.warning(f"Negative coordinates found in bounds: {bounds_str}")
-            left, top, right, bottom = (
-                max(0, left),
-                max(0, top),
-                max(0, right),
-                max(0, bottom),
-            )
-
-        if any(coord > 10000 for coord in (left, top, right, bottom)):
-            logger.warning(
-                f"Unusually large coordinates found in bounds: {bounds_str}"
-            )
-
-        return {"left": left, "top": top, "right": right, "bottom": bottom}
+        return _normalize_bounds(left, top, right, bottom, bounds_str)
 
     except (ValueError, IndexError, Exception) as e:
         logger.warning(f"Failed to parse bounds '{bounds_str}': {e}")
         return {"left": 0, "top": 0, "right": 0, "bottom": 0}
+
+
+def _normalize_bounds(
+    left: int, top: int, right: int, bottom: int, bounds_str: str
+) -> Dict[str, int]:
+    """Swap inverted edges and clamp negatives to zero."""
+    if left > right or top > bottom:
+        logger.warning(
+            f"Invalid bounds geometry: left={left}, top={top}, right={right}, bottom={bottom}"
+        )
+        left, right = min(left, right), max(left, right)
+        top, bottom = min(top, bottom), max(top, bottom)
+
+    if left < 0 or top < 0:  # right/bottom are >= left/top after the swap
+        logger.warning(f"Negative coordinates found in bounds: {bounds_str}")
+        left, top, right, bottom = (
+            max(0, left),
+            max(0, top),
+            max(0, right),
+            max(0, bottom),
+        )
+
+    if right > 10000 or bottom > 10000:
+        logger.warning(f"Unusually large coordinates found in bounds: {bounds_str}")
+
+    return {"left": left, "top": top, "right": right, "bottom": bottom}
@@ -12,34 +12,43 @@ import html
 import logging
 import re
 import xml.etree.ElementTree as ET
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
-from .ui_models import UIElement, parse_bounds
+from .ui_models import UIElement, parse_bounds_canonical
+
+try:  # Optional libxml2 backend: ``pip install android-mcp-server[xml]``
+    from lxml import etree as LET
+except ImportError:  # pragma: no cover - depends on the environment
+    LET = None
 
 logger = logging.getLogger(__name__)
 
+# uiautomator emits lowercase booleans; a dict hit skips the .lower()
+# allocation, and any other spelling falls back to a case-insensitive check.
+_BOOL_VALUES = {"true": True, "false": False}
 
-def clean_xml_content(xml_content: str) -> str:
-    """Strip control characters and invalid bytes from UI-dump XML."""
-    # Remove null bytes and other problematic characters
-    cleaned = (
-        xml_content.replace("\x00", "").replace("\x01", "").replace("\x02", "")
-    )
 
-    # Fix common XML encoding issues
-    cleaned = re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]", "", cleaned)
+def _is_true(value: str) -> bool:
+    """Return whether a boolean attribute value reads as true, ignoring case."""
+    flag = _BOOL_VALUES.get(value)
+    return value.lower() == "true" if flag is None else flag
 
-    # Remove or escape problematic attribute values
-    cleaned = re.sub(
-        r'text="[^"]*[\x00-\x08\x0B\x0C\x0E-\x1F\x7F][^"]*"', 'text=""', cleaned
-    )
-    cleaned = re.sub(
-        r'content-desc="[^"]*[\x00-\x08\x0B\x0C\x0E-\x1F\x7F][^"]*"',
-        'content-desc=""',
-        cleaned,
-    )
 
-    return cleaned
+# Characters that are illegal in XML 1.0 (everything below 0x20 except tab,
+# newline and carriage return, plus DEL), mapped to None for str.translate.
+_CONTROL_CHARS_TABLE = dict.fromkeys(
+    (*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F)
+)
+
+# Exceptions raised by whichever XML backend is active.
+_XML_PARSE_ERRORS: tuple = (ET.ParseError,)
+if LET is not None:
+    _XML_PARSE_ERRORS += (LET.XMLSyntaxError,)
+
+
+def clean_xml_content(xml_content: str) -> str:
+    """Strip control characters and invalid bytes from UI-dump XML."""
+    return xml_content.translate(_CONTROL_CHARS_TABLE)
 
 
 def escape_xml_content(xml_content: str) -> str:
@@ -74,18 +83,25 @@ def parse_element_attributes(element: ET.Element) -> Dict[str, Any]:
 
 
 class UIParser:
-    """Parse a uiautomator XML dump into :class:`UIElement` objects."""
+    """Parse a uiautomator XML dump into :class:`UIElement` objects.
+
+    Uses lxml's C parser when it is installed and falls back to
+    :mod:`xml.etree.ElementTree` otherwise; both reject malformed input the
+    same way, so the recovery strategies below behave identically. Dumps
+    are fed to a parser target rather than materialized as a DOM.
+    """
+
+    def __init__(self) -> None:
+        """Create the parser, preferring lxml when it is importable."""
+        self._use_lxml = LET is not None
 
     def parse(
         self, xml_content: str, include_invisible: bool = False
     ) -> List[UIElement]:
         """Parse XML dump into structured UIElement objects (best effort)."""
         try:
-            root = ET.fromstring(xml_content)
-            elements: List[UIElement] = []
-            self._parse_element_recursive(root, elements, "", include_invisible, 0)
-            return elements
-        except ET.ParseError as e:
+            return self._build_elements(xml_content, include_invisible)[0]
+        except _XML_PARSE_ERRORS as e:
             logger.error(f"XML parsing failed: {e}")
             return []
 
@@ -160,11 +176,13 @@ class UIParser:
         last_error = None
         for strategy, content in parse_attempts:
             try:
-                root = ET.fromstring(content)
-                elements: List[UIElement] = []
-                self._parse_element_recursive(root, elements, "", include_invisible, 0)
+                elements, stats = self._build_elements(content, include_invisible)
 
-                result: Dict[str, Any] = {"success": True, "elements": elements}
+                result: Dict[str, Any] = {
+                    "success": True,
+                    "elements": elements,
+                    "stats": stats,
+                }
 
                 if strategy != "direct":
                     warnings.append(
@@ -174,7 +192,7 @@ class UIParser:
 
                 return result
 
-            except ET.ParseError as e:
+            except _XML_PARSE_ERRORS as e:
                 last_error = str(e)
                 logger.warning(f"XML parsing failed with '{strategy}' strategy: {e}")
                 continue
@@ -202,25 +220,106 @@ class UIParser:
             "parsing_strategies_tried": [strategy for strategy, _ in parse_attempts],
         }
 
-    def _parse_element_recursive(
+    def _build_elements(
+        self, xml_content: str, include_invisible: bool
+    ) -> Tuple[List[UIElement], Dict[str, int]]:
+        """Parse ``xml_content`` into a pre-order element list plus stats.
+
+        The XML parser drives :class:`_UIElementBuilder` directly, so no
+        intermediate element tree is ever built.
+        """
+        builder = _UIElementBuilder(include_invisible)
+        if self._use_lxml:
+            parser: Any = LET.XMLParser(
+                target=builder,
+                resolve_entities=False,
+                no_network=True,
+            )
+        else:
+            parser = ET.XMLParser(target=builder)
+        # lxml refuses str input that carries an encoding declaration, and
+        # both backends accept bytes.
+        parser.feed(xml_content.encode("utf-8", errors="replace"))
+        return parser.close()
+
+
+class _UIElementBuilder:
+    """XML parser target that builds :class:`UIElement` records.
+
+    Receives ``start``/``end`` callbacks straight from the C parser (lxml or
+    expat). Each element is built on ``start`` and attached to the parent on
+    top of the stack. Invisible subtrees are skipped with a depth counter
+    unless ``include_invisible`` is set, so nothing is built for them.
+    """
+
+    def __init__(self, include_invisible: bool) -> None:
+        self._include_invisible = include_invisible
+        self._elements: List[UIElement] = []
+        self._clickable_count = 0
+        # One frame per open visible node: [element, next child index].
+        self._stack: List[List[Any]] = []
+        self._skip_depth = 0
+        # Per-dump intern pool: class names, ids and descriptions repeat
+        # across many nodes, so equal values share one string object.
+        interned: Dict[str, str] = {}
+        self._intern = interned.setdefault
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        """Handle an opening tag."""
+        if self._skip_depth:
+            self._skip_depth += 1
+            return
+
+        parent = self._stack[-1] if self._stack else None
+        index = 0
+        if parent is not None:
+            index = parent[1]
+            parent[1] += 1
+
+        # Skip invisible elements (and their subtree) unless requested
+        displayed = _is_true(attrib.get("displayed", "true"))
+        if not self._include_invisible and not displayed:
+            self._skip_depth = 1
+            return
+
+        ui_element = self._build_element(
+            attrib, displayed, tag, index, parent[0] if parent is not None else None
+        )
+        self._elements.append(ui_element)
+        self._clickable_count += ui_element.clickable
+        if parent is not None:
+            parent[0].children.append(ui_element)
+        self._stack.append([ui_element, 0])
+
+    def end(self, tag: str) -> None:
+        """Handle a closing tag."""
+        if self._skip_depth:
+            self._skip_depth -= 1
+        else:
+            self._stack.pop()
+
+    def close(self) -> Tuple[List[UIElement], Dict[str, int]]:
+        """Return the elements and their counts once parsing completes."""
+        stats = {
+            "total_elements": len(self._elements),
+            "clickable_elements": self._clickable_count,
+        }
+        return self._elements, stats
+
+    def _build_element(
         self,
-        element: ET.Element,
-        elements: List[UIElement],
-        xpath_prefix: str,
-        include_invisible: bool,
+        attrs: Dict[str, str],
+        displayed: bool,
+        tag: str,
         index: int,
-    ) -> int:
-        """Recursively parse XML elements into flat list + child trees."""
-        attrs = element.attrib
-
-        # Skip invisible elements unless requested
-        displayed = attrs.get("displayed", "true").lower() == "true"
-        if not include_invisible and not displayed:
-            return index
-
+        parent: Optional[UIElement],
+    ) -> UIElement:
+        """Create a childless :class:`UIElement` from a node's attributes."""
+        intern = self._intern
         # Parse bounds "[left,top][right,bottom]"
-        bounds_str = attrs.get("bounds", "[0,0][0,0]")
-        bounds = parse_bounds(bounds_str)
+        bounds, bounds_str = parse_bounds_canonical(
+            attrs.get("bounds", "[0,0][0,0]")
+        )
 
         # Calculate center point
         center = {
@@ -228,48 +327,31 @@ class UIParser:
             "y": (bounds["top"] + bounds["bottom"]) // 2,
         }
 
-        # Build xpath
-        tag_name = element.tag
-        xpath = f"{xpath_prefix}/{tag_name}[{index}]"
+        class_name = attrs.get("class", "")
+        resource_id = attrs.get("resource-id")
+        content_desc = attrs.get("content-desc")
 
-        # Create UIElement
-        ui_element = UIElement(
-            class_name=attrs.get("class", ""),
-            resource_id=attrs.get("resource-id"),
+        return UIElement(
+            class_name=intern(class_name, class_name),
+            resource_id=(
+                intern(resource_id, resource_id) if resource_id is not None else None
+            ),
             text=attrs.get("text"),
-            content_desc=attrs.get("content-desc"),
+            content_desc=(
+                intern(content_desc, content_desc)
+                if content_desc is not None
+                else None
+            ),
             bounds=bounds,
             center=center,
-            clickable=attrs.get("clickable", "false").lower() == "true",
-            enabled=attrs.get("enabled", "true").lower() == "true",
-            focusable=attrs.get("focusable", "false").lower() == "true",
-            scrollable=attrs.get("scrollable", "false").lower() == "true",
+            clickable=_is_true(attrs.get("clickable", "false")),
+            enabled=_is_true(attrs.get("enabled", "true")),
+            focusable=_is_true(attrs.get("focusable", "false")),
+            scrollable=_is_true(attrs.get("scrollable", "false")),
             displayed=displayed,
             children=[],
-            xpath=xpath,
             index=index,
+            tag=tag,
+            parent=parent,
+            bounds_str=bounds_str,
         )
-
-        elements.append(ui_element)
-
-        # Recursively parse children
-        child_index = 0
-        for child in element:
-            child_index = self._parse_element_recursive(
-                child, ui_element.children, xpath, include_invisible, child_index
-            )
-            # Also add children to the main elements list for easier access
-            self._add_children_to_main_list(ui_element.children, elements)
-            child_index += 1
-
-        return index + 1
-
-    def _add_children_to_main_list(
-        self, children: List[UIElement], main_list: List[UIElement]
-    ) -> None:
-        """Add children recursively to the main elements list."""
-        for child in children:
-            if child not in main_list:  # Avoid duplicates
-                main_list.append(child)
-            if child.children:
-                self._add_children_to_main_list(child.children, main_list)
@@ -1,7 +1,8 @@
 """ADB-facing UI layout retrieval.
 
-Coordinates the ``uiautomator dump`` command, pulls the resulting XML off
-the device (with retry/recovery logic), delegates parsing to
+Coordinates the ``uiautomator dump`` command, streams the resulting XML
+back over ``exec-out`` (or pulls it off /sdcard with retry/recovery logic
+on devices that cannot stream), delegates parsing to
 :class:`~.ui_parser.UIParser`, and formats the final result dictionary
 returned to tool callers.
 """
@@ -9,17 +10,56 @@ returned to tool callers.
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
 import xml.etree.ElementTree as ET
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 from .adb_manager import ADBCommands
 from .device_protocol import AndroidDeviceProtocol
-from .ui_models import UIElement
+from .ui_models import UIElement, format_bounds
 from .ui_parser import UIParser, parse_element_attributes
 
 logger = logging.getLogger(__name__)
 
+# Parsed layouts kept per extractor, keyed by a digest of the raw dump.
+_PARSE_CACHE_SIZE = 8
+
+# Parsing is CPU-bound; keep it off the event loop so concurrent adb I/O
+# (screenshots, logcat) is not stalled by large dumps. One pool is shared
+# by every extractor; its workers start on demand and are joined at exit.
+_PARSE_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ui-parse")
+
+# Marker in cat's error output when the dump file does not exist.
+_FILE_MISSING = "No such file"
+
+_HIERARCHY_CLOSE = "</hierarchy>"
+
+# uiautomator errors that can hit any dump, streamed or not; they say
+# nothing about whether the device can stream.
+_TRANSIENT_DUMP_ERRORS = ("could not get idle state", "null root node")
+
+# Consecutive unrecognized no-XML streams before a device is assumed
+# unable to stream.
+_STREAM_FAILURE_LIMIT = 3
+
+
+def _extract_streamed_dump(stdout: str) -> Optional[str]:
+    """Return the XML from ``uiautomator dump /dev/tty`` output, if any.
+
+    The dump is followed by a "UI hierchary dumped to: /dev/tty" status
+    line, which is cut off here.
+    """
+    start = stdout.find("<?xml")
+    if start < 0:
+        start = stdout.find("<hierarchy")
+    end = stdout.rfind(_HIERARCHY_CLOSE)
+    if start < 0 or end < start:
+        return None
+    return stdout[start : end + len(_HIERARCHY_CLOSE)]
+
 
 class UILayoutExtractor:
     """Extract and parse UI layout from uiautomator dump."""
@@ -32,6 +72,18 @@ class UILayoutExtractor:
         """
         self.adb_manager = adb_manager
         self._parser = UIParser()
+        # digest -> (element dicts, stats, parse warnings, root element);
+        # LRU ordered.
+        self._parse_cache: OrderedDict[
+            bytes,
+            Tuple[
+                List[Dict[str, Any]], Dict[str, int], List[str], Optional[UIElement]
+            ],
+        ] = OrderedDict()
+        # Devices whose uiautomator cannot dump to /dev/tty.
+        self._no_stream_dump: set[str] = set()
+        # device_id -> consecutive streams with unrecognized non-XML output
+        self._stream_failures: Dict[str, int] = {}
 
     async def get_ui_layout(
         self,
@@ -42,6 +94,7 @@ class UILayoutExtractor:
         adb_timeout: int | None = None,
         *,
         device_id: str,
+        include_hierarchy: bool = False,
     ) -> Dict[str, Any]:
         """Extract complete UI hierarchy with comprehensive error handling.
 
@@ -51,6 +104,7 @@ class UILayoutExtractor:
             "elements": List[UIElement],
             "xml_dump": str,
             "stats": {"total_elements": int, "clickable_elements": int},
+            "hierarchy": dict,  # Only when include_hierarchy is set
             "recovery_attempts": List[str],  # Added when recovery was attempted
             "warnings": List[str]  # Added when there are non-fatal issues
         }
@@ -61,17 +115,9 @@ class UILayoutExtractor:
 
         for attempt in range(max_retries if retry_on_failure else 1):
             try:
-                # Get UI dump command
-                command = (
-                    ADBCommands.UI_DUMP_COMPRESSED
-                    if compressed
-                    else ADBCommands.UI_DUMP
-                )
                 # Use a shorter ADB timeout if provided (helps avoid hangs on heavy apps like Chrome)
-                result = await self.adb_manager.execute_adb_command(
-                    command,
-                    device_id=device_id,
-                    timeout=(adb_timeout or 30),
+                result, xml_content = await self._run_ui_dump(
+                    compressed, adb_timeout, device_id=device_id
                 )
 
                 if not result["success"]:
@@ -112,11 +158,12 @@ class UILayoutExtractor:
                             ],
                         }
 
-                # Pull XML file from device with retry logic
-                xml_content = await self._pull_ui_dump_file_with_retry(
-                    device_id=device_id,
-                    adb_timeout=adb_timeout,
-                )
+                if xml_content is None:
+                    # Pull XML file from device with retry logic
+                    xml_content = await self._pull_ui_dump_file_with_retry(
+                        device_id=device_id,
+                        adb_timeout=adb_timeout,
+                    )
                 if not xml_content:
                     if attempt < max_retries - 1 and retry_on_failure:
                         recovery_attempts.append(
@@ -137,62 +184,92 @@ class UILayoutExtractor:
                             ],
                         }
 
-                # Parse XML to structured elements with enhanced error handling
-                parse_result = await self._parse_xml_to_elements_safe(
-                    xml_content, include_invisible
-                )
+                # Identical dumps (polling an unchanged screen) reuse the
+                # previous parse instead of re-parsing.
+                cache_key = hashlib.blake2b(
+                    xml_content.encode("utf-8", errors="replace"),
+                    digest_size=16,
+                    person=b"visible" if not include_invisible else b"all",
+                ).digest()
+                cached = self._parse_cache.get(cache_key)
+                if cached is not None:
+                    self._parse_cache.move_to_end(cache_key)
+                    elements_dict, stats, parse_warnings, root = cached
+                    warnings.extend(parse_warnings)
+                else:
+                    # Parse XML to structured elements with enhanced error handling
+                    parse_result = await self._parse_xml_to_elements_safe(
+                        xml_content, include_invisible
+                    )
 
-                if not parse_result["success"]:
-                    if attempt < max_retries - 1 and retry_on_failure:
-                        recovery_attempts.append(
-                            f"Attempt {attempt + 1}: {parse_result['error']} - Retrying..."
-                        )
-                        await asyncio.sleep(1)
-                        continue
-                    else:
-                        return {
-                            "success": False,
-                            "error": parse_result["error"],
-                            "recovery_attempts": recovery_attempts,
-                            "recovery_suggestions": parse_result.get(
-                                "recovery_suggestions", []
-                            ),
-                            "xml_preview": (
-                                xml_content[:500] + "..." if xml_content else None
+                    if not parse_result["success"]:
+                        if attempt < max_retries - 1 and retry_on_failure:
+                            recovery_attempts.append(
+                                f"Attempt {attempt + 1}: {parse_result['error']} - Retrying..."
+                            )
+                            await asyncio.sleep(1)
+                            continue
+                        else:
+                            return {
+                                "success": False,
+                                "error": parse_result["error"],
+                                "recovery_attempts": recovery_attempts,
+                                "recovery_suggestions": parse_result.get(
+                                    "recovery_suggestions", []
+                                ),
+                                "xml_preview": (
+                                    xml_content[:500] + "..." if xml_content else None
+                                ),
+                            }
+
+                    elements = parse_result["elements"]
+                    if parse_result.get("warnings"):
+                        warnings.extend(parse_result["warnings"])
+
+                    # Convert UIElement objects to dictionaries for consistency
+                    elements_dict = []
+                    for element in elements:
+                        element_dict = {
+                            "text": element.text or "",
+                            "resource-id": element.resource_id or "",
+                            "class": element.class_name,
+                            "content-desc": element.content_desc or "",
+                            "bounds": (
+                                element.bounds_str or format_bounds(element.bounds)
                             ),
+                            "clickable": "true" if element.clickable else "false",
+                            "enabled": "true" if element.enabled else "false",
+                            "focusable": "true" if element.focusable else "false",
+                            "scrollable": "true" if element.scrollable else "false",
+                            "displayed": "true" if element.displayed else "false",
                         }
+                        elements_dict.append(element_dict)
+
+                    stats = parse_result["stats"]
+                    root = elements[0] if elements else None
+                    self._parse_cache[cache_key] = (
+                        elements_dict,
+                        stats,
+                        list(parse_result.get("warnings") or []),
+                        root,
+                    )
+                    if len(self._parse_cache) > _PARSE_CACHE_SIZE:
+                        self._parse_cache.popitem(last=False)
 
-                elements = parse_result["elements"]
-                if parse_result.get("warnings"):
-                    warnings.extend(parse_result["warnings"])
-
-                # Convert UIElement objects to dictionaries for consistency
-                elements_dict = []
-                for element in elements:
-                    element_dict = {
-                        "text": element.text or "",
-                        "resource-id": element.resource_id or "",
-                        "class": element.class_name,
-                        "content-desc": element.content_desc or "",
-                        "bounds": (
-                            f"[{element.bounds['left']},{element.bounds['top']}]"
-                            f"[{element.bounds['right']},{element.bounds['bottom']}]"
-                        ),
-                        "clickable": "true" if element.clickable else "false",
-                        "enabled": "true" if element.enabled else "false",
-                        "focusable": "true" if element.focusable else "false",
-                        "scrollable": "true" if element.scrollable else "false",
-                        "displayed": "true" if element.displayed else "false",
-                    }
-                    elements_dict.append(element_dict)
-
+                # The cache keeps the originals; callers get their own dicts
+                # so annotating them can't leak into later identical dumps.
                 result_dict = {
                     "success": True,
-                    "elements": elements_dict,
+                    "elements": [dict(element) for element in elements_dict],
                     "xml_dump": xml_content,
-                    "stats": self._calculate_stats(elements),
-                    "element_count": self._calculate_stats(elements)["total_elements"],
+                    "stats": dict(stats),
+                    "element_count": stats["total_elements"],
                 }
+                if include_hierarchy:
+                    # The parser already linked each element to its children.
+                    result_dict["hierarchy"] = (
+                        self._build_hierarchy_dict([root]) if root else {}
+                    )
 
                 if recovery_attempts:
                     result_dict["recovery_attempts"] = recovery_attempts
@@ -228,27 +305,70 @@ class UILayoutExtractor:
             ],
         }
 
-    async def _pull_ui_dump_file(self, *, device_id: str) -> Optional[str]:
-        """Pull UI dump file from device."""
-        try:
-            # UI dump is saved to /sdcard/window_dump.xml
-            device_path = "/sdcard/window_dump.xml"
+    async def _run_ui_dump(
+        self, compressed: bool, adb_timeout: int | None, *, device_id: str
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Run ``uiautomator dump``, streaming the XML back when possible.
 
-            # Use cat to read the file content directly
+        Returns the adb result plus the dump XML when it arrived on stdout.
+        ``None`` means the dump went to /sdcard and must be pulled. A device
+        is only remembered as unable to stream when a dump completes without
+        XML on stdout, or after repeated unrecognized output; transient
+        uiautomator errors are reported as an ordinary failed dump.
+        """
+        timeout = adb_timeout or 30
+        if device_id not in self._no_stream_dump:
             result = await self.adb_manager.execute_adb_command(
-                f"adb -s {{device}} shell cat {device_path}",
+                (
+                    ADBCommands.UI_DUMP_STREAM_COMPRESSED
+                    if compressed
+                    else ADBCommands.UI_DUMP_STREAM
+                ),
                 device_id=device_id,
+                timeout=timeout,
             )
+            # A failed stream (e.g. a uiautomator timeout) is reported as
+            # is rather than paying for a second dump on the file path.
+            if not result["success"]:
+                return result, None
+            stdout = result.get("stdout") or ""
+            xml_content = _extract_streamed_dump(stdout)
+            if xml_content is not None:
+                self._stream_failures.pop(device_id, None)
+                return result, xml_content
+
+            output = f"{stdout}{result.get('stderr') or ''}".strip()
+            lowered = output.lower()
+            if any(marker in lowered for marker in _TRANSIENT_DUMP_ERRORS):
+                return {
+                    **result,
+                    "success": False,
+                    "error": f"UI dump failed: {output}",
+                }, None
+
+            # A dump that completed (or printed nothing) yet streamed no XML
+            # shows the device can't stream; other output may be a one-off.
+            failures = self._stream_failures.get(device_id, 0) + 1
+            unrecognized = bool(output) and "dumped to" not in lowered
+            if unrecognized and failures < _STREAM_FAILURE_LIMIT:
+                self._stream_failures[device_id] = failures
+                logger.info(
+                    f"Streamed UI dump on {device_id} returned no XML; "
+                    "using /sdcard file for this dump"
+                )
+            else:
+                logger.info(
+                    f"Device {device_id} cannot stream UI dumps; using /sdcard file"
+                )
+                self._stream_failures.pop(device_id, None)
+                self._no_stream_dump.add(device_id)
 
-            if result["success"] and result["stdout"].strip():
-                return result["stdout"]
-
-            logger.error(f"Failed to read UI dump: {result}")
-            return None
-
-        except Exception as e:
-            logger.error(f"Failed to pull UI dump file: {e}")
-            return None
+        result = await self.adb_manager.execute_adb_command(
+            ADBCommands.UI_DUMP_COMPRESSED if compressed else ADBCommands.UI_DUMP,
+            device_id=device_id,
+            timeout=timeout,
+        )
+        return result, None
 
     async def _pull_ui_dump_file_with_retry(
         self,
@@ -262,32 +382,24 @@ class UILayoutExtractor:
 
         for attempt in range(max_attempts):
             try:
-                # First, check if file exists
-                check_result = await self.adb_manager.execute_adb_command(
-                    f"adb -s {{device}} shell test -f {device_path} && echo 'exists' || echo 'missing'",
-                    device_id=device_id,
-                    timeout=(adb_timeout or 10),
-                )
-
-                if check_result["success"]:
-                    if "missing" in check_result["stdout"]:
-                        logger.warning(
-                            f"UI dump file not found at {device_path} (attempt {attempt + 1})"
-                        )
-                        if attempt < max_attempts - 1:
-                            await asyncio.sleep(0.5)  # Wait for file to be created
-                            continue
-                        return None
-
-                # Try to read the file content
+                # Read the file directly; a missing dump shows up as cat's
+                # "No such file" error rather than needing a separate probe.
                 result = await self.adb_manager.execute_adb_command(
-                    f"adb -s {{device}} shell cat {device_path}",
+                    ADBCommands.UI_DUMP_FETCH,
                     device_id=device_id,
                     timeout=(adb_timeout or 10),
                 )
 
-                if result["success"] and result["stdout"].strip():
-                    content = result["stdout"].strip()
+                stdout = (result.get("stdout") or "").strip()
+                if not stdout.startswith("<") and _FILE_MISSING in (
+                    f"{stdout}{result.get('stderr') or ''}"
+                ):
+                    # exec-out may deliver cat's error on stdout
+                    logger.warning(
+                        f"UI dump file not found at {device_path} (attempt {attempt + 1})"
+                    )
+                elif result["success"] and stdout:
+                    content = stdout
 
                     # Basic validation of XML content
                     if not content.startswith("<") or not content.endswith(">"):
@@ -323,29 +435,20 @@ class UILayoutExtractor:
 
         return None
 
-    async def _parse_xml_to_elements(
-        self, xml_content: str, include_invisible: bool = False
-    ) -> List[UIElement]:
-        """Parse XML dump into structured UIElement objects."""
-        return self._parser.parse(xml_content, include_invisible)
-
     async def _parse_xml_to_elements_safe(
         self, xml_content: str, include_invisible: bool = False
     ) -> Dict[str, Any]:
         """Parse XML dump with comprehensive error handling and recovery attempts."""
-        return self._parser.parse_safe(xml_content, include_invisible)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _PARSE_EXECUTOR, self._parse_sync, xml_content, include_invisible
+        )
 
-    def _calculate_stats(self, elements: List[UIElement]) -> Dict[str, int]:
-        """Calculate statistics for UI elements.
-
-        The ``elements`` list is already flat (every descendant is appended via
-        ``_add_children_to_main_list``), so we must not recurse into
-        ``element.children`` — doing so would double-count every non-leaf node.
-        """
-        return {
-            "total_elements": len(elements),
-            "clickable_elements": sum(1 for e in elements if e.clickable),
-        }
+    def _parse_sync(
+        self, xml_content: str, include_invisible: bool = False
+    ) -> Dict[str, Any]:
+        """Blocking body of :meth:`_parse_xml_to_elements_safe`."""
+        return self._parser.parse_safe(xml_content, include_invisible)
 
     async def extract_ui_hierarchy(self, *, device_id: str) -> Dict[str, Any]:
         """Extract UI hierarchy structure.
@@ -358,21 +461,19 @@ class UILayoutExtractor:
         }
         """
         try:
-            layout_result = await self.get_ui_layout(device_id=device_id)
+            layout_result = await self.get_ui_layout(
+                device_id=device_id, include_hierarchy=True
+            )
             if not layout_result["success"]:
                 return {
                     "success": False,
                     "error": layout_result.get("error", "Failed to get UI layout"),
                 }
 
-            elements = layout_result["elements"]
-            # Note: elements are now dictionaries, not UIElement objects
-            hierarchy = self._build_hierarchy_dict_from_dicts(elements)
-
             return {
                 "success": True,
-                "hierarchy": hierarchy,
-                "total_elements": len(elements),
+                "hierarchy": layout_result["hierarchy"],
+                "total_elements": len(layout_result["elements"]),
             }
 
         except Exception as e:
@@ -380,11 +481,14 @@ class UILayoutExtractor:
             return {"success": False, "error": str(e)}
 
     def _build_hierarchy_dict(self, elements: List[UIElement]) -> Dict[str, Any]:
-        """Build hierarchical dictionary from flat element list."""
+        """Build a nested dictionary rooted at ``elements[0]``.
+
+        Relies on the ``children`` links the parser sets up, so only the
+        root of a parsed layout is needed.
+        """
         if not elements:
             return {}
 
-        # For simplicity, return the root element with its children
         root_element = elements[0]
         return {
             "class": root_element.class_name,
@@ -411,23 +515,6 @@ class UILayoutExtractor:
             result.append(child_dict)
         return result
 
-    def _build_hierarchy_dict_from_dicts(
-        self, elements: List[Dict[str, Any]]
-    ) -> Dict[str, Any]:
-        """Build hierarchical dictionary from dictionary elements."""
-        if not elements:
-            return {}
-
-        # For simplicity, return the first element as root
-        root_element = elements[0]
-        return {
-            "class": root_element.get("class", ""),
-            "resource-id": root_element.get("resource-id", ""),
-            "text": root_element.get("text", ""),
-            "bounds": root_element.get("bounds", ""),
-            "children": elements[1:] if len(elements) > 1 else [],
-        }
-
     def parse_element_attributes(self, element: ET.Element) -> Dict[str, Any]:
         """Parse XML element attributes to dictionary.
 
@@ -8,7 +8,8 @@ import logging
 import os
 import re
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +23,8 @@ class SecurityLevel(Enum):
 class ValidationResult:
     """Result of a validation operation (valid/sanitized value, errors, warnings)."""
 
+    __slots__ = ("is_valid", "sanitized_value", "errors", "warnings")
+
     def __init__(
         self,
         is_valid: bool,
@@ -44,6 +47,13 @@ class ValidationResult:
         """Record a non-fatal warning message."""
         self.warnings.append(warning)
 
+    def merge(self, other: "ValidationResult") -> None:
+        """Fold another result's errors, warnings and validity into this one."""
+        self.errors.extend(other.errors)
+        self.warnings.extend(other.warnings)
+        if not other.is_valid:
+            self.is_valid = False
+
 def _fail(msg: str) -> ValidationResult:
     r = ValidationResult(False)
     r.errors.append(msg)
@@ -51,15 +61,25 @@ def _fail(msg: str) -> ValidationResult:
 
 
 _SHELL_METACHARS = frozenset(";&|`$()[]{}><*?!\"'\\\n\r\t")
-_FILENAME_BAD = {"<", ">", "|", ":", "*", "?", '"', "\x00"}
+_SHELL_ESCAPES = str.maketrans({c: f"\\{c}" for c in _SHELL_METACHARS})
+_FILENAME_BAD = frozenset('<>|:*?"\x00')
+# Reserved device names, matched on the basename: CON/PRN/AUX/NUL exactly,
+# anything starting with COM or LPT.
+_RESERVED_RE = re.compile(r"(?:.*/)?(?:CON|PRN|AUX|NUL|(?:COM|LPT)[^/]*)\Z", re.I | re.S)
 _INJECTION = [r";\s*\w+", r"&&\s*\w+", r"\|\s*\w+", r"`[^`]*`", r"\$\([^)]*\)",
               r">\s*/", r"<\s*/", r"\\\w+",
               r"<script[^>]*>", r"</script>", r"javascript:", r"on\w+\s*="]
+_INJECTION_RES = [(p, re.compile(p, re.IGNORECASE)) for p in _INJECTION]
+# One scan rejects clean input; the per-pattern loop only runs on a hit.
+_INJECTION_ANY = re.compile("|".join(f"(?:{p})" for p in _INJECTION), re.IGNORECASE)
+# Short text with no metacharacters, injection triggers (":", "=") or
+# edge whitespace passes every check unchanged at any security level.
+_SAFE_TEXT_RE = re.compile(r"(?:[\w.@/+,-](?:[\w .@/+,-]{0,998}[\w.@/+,-])?)?", re.ASCII)
 _IDENT_RE = re.compile(r"[;&|`$(){}><*?!\"'\\]")
 _DEVICE_RE = re.compile(r"^[A-Za-z0-9._:\-]+$")
-_DIRECTIONS = {"up", "down", "left", "right"}
-_LOG_PRIORITIES = {"V", "D", "I", "W", "E", "F", "S"}
-_KEYCODES = {
+_DIRECTIONS = frozenset({"up", "down", "left", "right"})
+_LOG_PRIORITIES = frozenset({"V", "D", "I", "W", "E", "F", "S"})
+_KEYCODES = frozenset({
     "BACK", "HOME", "MENU", "SEARCH", "VOLUME_UP", "VOLUME_DOWN", "POWER",
     "CAMERA", "FOCUS", "ENTER", "DEL", "TAB", "SPACE", "ESCAPE", "CLEAR",
     "PAGE_UP", "PAGE_DOWN", "MOVE_HOME", "MOVE_END", "INSERT", "FORWARD_DEL",
@@ -68,11 +88,53 @@ _KEYCODES = {
     "MEDIA_PLAY", "MEDIA_PAUSE", "MEDIA_PLAY_PAUSE", "MEDIA_STOP",
     "MEDIA_NEXT", "MEDIA_PREVIOUS", "MEDIA_REWIND", "MEDIA_FAST_FORWARD",
     *"ABCDEFGHIJKLMNOPQRSTUVWXYZ", *"0123456789",
-}
+})
+# Names accepted with or without the KEYCODE_ prefix, for a single lookup.
+_KEYCODE_NAMES = _KEYCODES | {f"KEYCODE_{k}" for k in _KEYCODES}
+
+def _check_shell(
+    text: str, level: SecurityLevel
+) -> Tuple[bool, Optional[str], Tuple[str, ...], Tuple[str, ...]]:
+    """Run the full shell-safety checks; returns (valid, value, errors, warnings)."""
+    errors: List[str] = []
+    warnings: List[str] = []
+    strict = level is SecurityLevel.STRICT
+    report = errors.append if strict else warnings.append
+    if _INJECTION_ANY.search(text):
+        for p, rx in _INJECTION_RES:
+            if rx.search(text):
+                report(f"{'Potentially dangerous' if strict else 'Suspicious'} pattern detected: {p}")
+    bad = _SHELL_METACHARS.intersection(text)
+    if bad:
+        joined = ", ".join(sorted(bad))
+        if strict:
+            errors.append(f"Dangerous shell characters detected: {joined}")
+        else:
+            text = text.translate(_SHELL_ESCAPES)
+            warnings.append(f"Escaped dangerous characters: {joined}")
+    if len(text) > 1000:
+        warnings.append(f"Text input is very long ({len(text)} characters)")
+    if "\x00" in text:
+        errors.append("Null bytes not allowed in text input")
+        return False, None, tuple(errors), tuple(warnings)
+    if strict:
+        stripped = text.strip()
+        if len(stripped) != len(text):
+            warnings.append("Text contains leading/trailing whitespace")
+            text = stripped
+    return not errors, text, tuple(errors), tuple(warnings)
+
+
+# Element searches re-validate the same ids and class names constantly;
+# results are immutable tuples so hits can be shared. Long text bypasses it.
+_check_shell_cached = lru_cache(maxsize=2048)(_check_shell)
+
 
 class ParameterValidator:
     """Unified security validator for MCP tool parameters."""
 
+    __slots__ = ("security_level",)
+
     def __init__(self, security_level: SecurityLevel = SecurityLevel.STRICT):
         """Initialize the validator with the given security level."""
         self.security_level = security_level
@@ -81,33 +143,11 @@ class ParameterValidator:
     def _sanitize_shell(text: str, level: SecurityLevel) -> ValidationResult:
         if not isinstance(text, str):
             return _fail(f"Input must be string, got {type(text).__name__}")
-        r = ValidationResult(True)
-        strict = level == SecurityLevel.STRICT
-        report = r.add_error if strict else r.add_warning
-        for p in _INJECTION:
-            if re.search(p, text, re.IGNORECASE):
-                report(f"{'Potentially dangerous' if strict else 'Suspicious'} pattern detected: {p}")
-        bad = set(text) & _SHELL_METACHARS
-        if bad:
-            joined = ", ".join(sorted(bad))
-            if strict:
-                r.add_error(f"Dangerous shell characters detected: {joined}")
-            else:
-                for c in bad:
-                    text = text.replace(c, f"\\{c}")
-                r.add_warning(f"Escaped dangerous characters: {joined}")
-        if len(text) > 1000:
-            r.add_warning(f"Text input is very long ({len(text)} characters)")
-        if "\x00" in text:
-            r.add_error("Null bytes not allowed in text input")
-            return r
-        if strict and len(text) != len(text.strip()):
-            r.add_warning("Text contains leading/trailing whitespace")
-            text = text.strip()
-        r.sanitized_value = text
-        if r.errors and strict:
-            r.is_valid = False
-        return r
+        if _SAFE_TEXT_RE.fullmatch(text):
+            return ValidationResult(True, text)
+        check = _check_shell_cached if len(text) <= 1000 else _check_shell
+        is_valid, value, errors, warnings = check(text, level)
+        return ValidationResult(is_valid, value, list(errors), list(warnings))
 
     def validate_text(self, text: str, *, max_length: Optional[int] = 1000) -> ValidationResult:
         """Validate and sanitize generic user-supplied text."""
@@ -127,6 +167,12 @@ class ParameterValidator:
         x: int, y: int, *, max_x: Optional[int] = None, max_y: Optional[int] = None
     ) -> ValidationResult:
         """Validate an (x, y) screen coordinate pair, optionally bounded by max_x/max_y."""
+        # Fast accept; the loop below only runs to name the failing check.
+        if (
+            type(x) is int and type(y) is int and x >= 0 and y >= 0
+            and (max_x is None or x <= max_x) and (max_y is None or y <= max_y)
+        ):
+            return ValidationResult(True, (x, y))
         for name, v, hi in (("x", x, max_x), ("y", y, max_y)):
             if not isinstance(v, int) or isinstance(v, bool):
                 return _fail(f"{name} must be int, got {type(v).__name__}")
@@ -157,22 +203,21 @@ class ParameterValidator:
         """Validate a filename; rejects path traversal and dangerous characters."""
         if not isinstance(filename, str):
             return _fail(f"Filename must be string, got {type(filename).__name__}")
-        if not filename.strip():
-            return _fail("Filename cannot be empty")
         filename = filename.strip()
+        if not filename:
+            return _fail("Filename cannot be empty")
         r = ValidationResult(True)
         if ".." in filename or filename.startswith("/"):
             if not allow_path:
                 return _fail(f"Path traversal detected in filename: {filename}")
             r.add_warning(f"Absolute/relative path detected: {filename}")
-        bad = set(filename) & _FILENAME_BAD
+        bad = _FILENAME_BAD.intersection(filename)
         if bad:
             return _fail(f"Dangerous characters in filename: {', '.join(sorted(bad))}")
         if len(filename) > 255:
             return _fail(f"Filename too long ({len(filename)} characters)")
-        base = os.path.basename(filename).upper()
-        if base in {"CON", "PRN", "AUX", "NUL"} or base.startswith(("COM", "LPT")):
-            r.add_warning(f"Reserved filename detected: {base}")
+        if _RESERVED_RE.match(filename):
+            r.add_warning(f"Reserved filename detected: {os.path.basename(filename).upper()}")
         r.sanitized_value = filename
         return r
 
@@ -193,7 +238,7 @@ class ParameterValidator:
         return ValidationResult(True, value)
 
     @staticmethod
-    def _validate_enum(value: str, allowed: set, field: str, upper: bool) -> ValidationResult:
+    def _validate_enum(value: str, allowed: frozenset, field: str, upper: bool) -> ValidationResult:
         if not isinstance(value, str):
             return _fail(f"{field} must be string, got {type(value).__name__}")
         n = value.strip().upper() if upper else value.strip().lower()
@@ -222,9 +267,7 @@ class ParameterValidator:
                 return ValidationResult(True, str(n))
             return _fail(f"Numeric keycode out of valid range (0-300): {n}")
         upper = keycode.upper()
-        if upper in _KEYCODES:
-            return ValidationResult(True, upper)
-        if upper.startswith("KEYCODE_") and (upper[8:] in _KEYCODES or upper[8:].isdigit()):
+        if upper in _KEYCODE_NAMES or (upper.startswith("KEYCODE_") and upper[8:].isdigit()):
             return ValidationResult(True, upper)
         return _fail(f"Unknown Android keycode: {keycode}")
 
@@ -242,22 +285,21 @@ class ParameterValidator:
                   "content_desc": content_desc, "class_name": class_name}
         if not any(params.values()):
             return _fail("At least one search parameter must be provided")
+        given = {k: v for k, v in params.items() if v is not None}
+        # Plain values pass at every level: accept them all in one sweep.
+        if all(type(v) is str and _SAFE_TEXT_RE.fullmatch(v) for v in given.values()):
+            return ValidationResult(True, given)
         r = ValidationResult(True)
         sanitized: Dict[str, str] = {}
-        for name, value in params.items():
-            if value is None:
-                continue
+        for name, value in given.items():
             # UI text stays permissive; IDs/class names use configured level.
             level = SecurityLevel.MODERATE if name in ("text", "content_desc") else self.security_level
             sub = self._sanitize_shell(value, level)
             if sub.is_valid:
                 sanitized[name] = sub.sanitized_value
             else:
-                r.errors.extend(sub.errors)
-                r.warnings.extend(sub.warnings)
-        if r.errors:
-            r.is_valid = False
-        else:
+                r.merge(sub)
+        if r.is_valid:
             r.sanitized_value = sanitized
         return r
 
@@ -296,12 +338,13 @@ def log_validation_attempt(
     operation: str, params: Dict[str, Any], result: ValidationResult, logger: logging.Logger
 ) -> None:
     """Log a validation attempt at the appropriate level based on the result state."""
+    # %-style args: params are only formatted if a handler emits the record.
     if not result.is_valid:
-        logger.warning(f"Validation failed for {operation}: {result.errors}. Parameters: {params}")
+        logger.warning("Validation failed for %s: %s. Parameters: %s", operation, result.errors, params)
     elif result.warnings:
-        logger.info(f"Validation warnings for {operation}: {result.warnings}. Parameters: {params}")
+        logger.info("Validation warnings for %s: %s. Parameters: %s", operation, result.warnings, params)
     else:
-        logger.debug(f"Validation passed for {operation}")
+        logger.debug("Validation passed for %s", operation)
 
 
 # Back-compat alias (legacy name used by some test doubles).
@@ -0,0 +1,16 @@
+"""Shared setup for the MCP client probe scripts in this directory."""
+
+import importlib.util
+import subprocess
+import sys
+
+
+def ensure_mcp():
+    """Install the ``mcp`` client package if it is not importable.
+
+    Uses ``find_spec`` so the presence check does not import the package;
+    pip only runs when ``mcp`` is actually missing.
+    """
+    if importlib.util.find_spec("mcp") is None:
+        print("Installing MCP client...")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "mcp"])
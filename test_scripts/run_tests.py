@@ -1,12 +1,54 @@
 #!/usr/bin/env python3
 """Simple test runner for Android MCP Server."""
 
+import contextlib
+import importlib.util
+import io
 import os
+import py_compile
 import subprocess
 import sys
 from pathlib import Path
 
 
+def check_syntax(path):
+    """Raise py_compile.PyCompileError if the file does not compile.
+
+    Files whose cached bytecode is newer than the source are skipped, and
+    fresh compiles are written to __pycache__ so the next run skips them.
+    """
+    cached = Path(importlib.util.cache_from_source(str(path)))
+    try:
+        if cached.stat().st_mtime >= path.stat().st_mtime:
+            return
+    except OSError:
+        pass
+    py_compile.compile(str(path), doraise=True)
+
+
+def collect_tests(project_root, isolated=False):
+    """Run pytest collection and return (returncode, stdout, stderr).
+
+    Collection runs in this interpreter, reusing the pytest import above;
+    pass ``isolated=True`` (``--isolated`` on the command line) to spawn a
+    separate ``python -m pytest`` instead.
+    """
+    args = ["--collect-only", "-q", "tests/"]
+    if isolated:
+        result = subprocess.run(
+            [sys.executable, "-m", "pytest", *args],
+            capture_output=True, text=True, cwd=project_root,
+        )
+        return result.returncode, result.stdout, result.stderr
+
+    import pytest
+
+    out, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        returncode = pytest.main(args)
+    return int(returncode), out.getvalue(), err.getvalue()
+
+
 def main():
     """Run the test suite with basic validation."""
     project_root = Path(__file__).parent
@@ -29,9 +71,16 @@ def main():
         print("❌ tests/ directory not found")
         sys.exit(1)
 
-    test_files = list(tests_dir.glob("test_*.py"))
+    with os.scandir(tests_dir) as entries:
+        test_files = sorted(
+            Path(entry.path)
+            for entry in entries
+            if entry.name.startswith("test_")
+            and entry.name.endswith(".py")
+            and entry.is_file(follow_symlinks=False)
+        )
     print(f"✅ Found {len(test_files)} test files:")
-    for test_file in sorted(test_files):
+    for test_file in test_files:
         print(f"   • {test_file.name}")
 
     # Check mock infrastructure
@@ -47,11 +96,10 @@ def main():
 
     for test_file in test_files:
         try:
-            with open(test_file, 'r') as f:
-                compile(f.read(), test_file, 'exec')
+            check_syntax(test_file)
             print(f"   ✅ {test_file.name}")
-        except SyntaxError as e:
-            print(f"   ❌ {test_file.name}: {e}")
+        except py_compile.PyCompileError as e:
+            print(f"   ❌ {test_file.name}: {e.msg}")
             syntax_errors += 1
 
     if syntax_errors > 0:
@@ -64,11 +112,10 @@ def main():
     conftest_file = tests_dir / "conftest.py"
     if conftest_file.exists():
         try:
-            with open(conftest_file, 'r') as f:
-                compile(f.read(), conftest_file, 'exec')
+            check_syntax(conftest_file)
             print("✅ conftest.py syntax valid")
-        except SyntaxError as e:
-            print(f"❌ conftest.py syntax error: {e}")
+        except py_compile.PyCompileError as e:
+            print(f"❌ conftest.py syntax error: {e.msg}")
             return False
     else:
         print("⚠️  conftest.py not found")
@@ -86,13 +133,12 @@ def main():
     # Test discovery
     print(f"\n🔍 Testing pytest discovery...")
     try:
-        result = subprocess.run([
-            sys.executable, "-m", "pytest",
-            "--collect-only", "-q", "tests/"
-        ], capture_output=True, text=True, cwd=project_root)
+        returncode, stdout, stderr = collect_tests(
+            project_root, isolated="--isolated" in sys.argv
+        )
 
-        if result.returncode == 0:
-            lines = result.stdout.strip().split('\n')
+        if returncode == 0:
+            lines = stdout.strip().split('\n')
             collected = [line for line in lines if 'collected' in line]
             if collected:
                 print(f"✅ {collected[-1]}")
@@ -100,7 +146,7 @@ def main():
                 print("✅ Test discovery completed")
         else:
             print(f"⚠️  Test discovery issues:")
-            print(result.stderr)
+            print(stderr or stdout)
     except Exception as e:
         print(f"⚠️  Could not run test discovery: {e}")
 
@@ -3,16 +3,12 @@
 
 import asyncio
 import json
-import subprocess
-import sys
-
-try:
-    from mcp import ClientSession, StdioServerParameters
-    from mcp.client.stdio import stdio_client
-except ImportError:
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "mcp"])
-    from mcp import ClientSession, StdioServerParameters
-    from mcp.client.stdio import stdio_client
+
+from _mcp_bootstrap import ensure_mcp
+
+ensure_mcp()
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
 
 
 async def test_basic_tool():
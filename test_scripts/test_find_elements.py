@@ -3,24 +3,68 @@
 
 import asyncio
 import json
-import subprocess
 import sys
 import time
 from pathlib import Path
 
-# Install MCP if needed
-try:
-    from mcp import ClientSession, StdioServerParameters
-    from mcp.client.stdio import stdio_client
-except ImportError:
-    print("Installing MCP client...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "mcp"])
-    from mcp import ClientSession, StdioServerParameters
-    from mcp.client.stdio import stdio_client
-
-
-async def test_find_elements_performance():
-    """Test find_elements with non-existent elements to measure response time."""
+from _mcp_bootstrap import ensure_mcp
+
+ensure_mcp()
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+
+# (description, find_elements arguments) for each probe.
+PROBES = [
+    (
+        "search for non-existent element",
+        {"text": "NonExistentButton123456", "exact_match": True},
+    ),
+    (
+        "multiple non-existent search criteria",
+        {
+            "text": "NonExistent",
+            "resource_id": "com.fake.app:id/fake_button",
+            "content_desc": "Fake description that does not exist",
+        },
+    ),
+    (
+        "class_name search (potentially slower)",
+        {"class_name": "android.widget.NonExistentWidget"},
+    ),
+]
+
+
+async def timed_call(session, arguments):
+    """Call find_elements and return (result, duration in seconds)."""
+    start_time = time.perf_counter()
+    result = await session.call_tool(name="find_elements", arguments=arguments)
+    return result, time.perf_counter() - start_time
+
+
+def report(index, description, result, duration):
+    """Print the outcome of one probe."""
+    print(f"\n{index}. Testing {description}...")
+    if result.content and result.content[0].text:
+        response = json.loads(result.content[0].text)
+        if response.get("success"):
+            count = response.get("count", 0)
+            print(f"✅ Found {count} elements in {duration:.2f} seconds")
+            if count == 0 and duration > 1.0:
+                print(f"   ⚠️  Took longer than expected for empty result")
+        else:
+            print(f"❌ Failed: {response.get('error')}")
+            print(f"   Duration: {duration:.2f} seconds")
+    else:
+        print(f"❌ No response content, duration: {duration:.2f} seconds")
+
+
+async def test_find_elements_performance(serial=False):
+    """Test find_elements with non-existent elements to measure response time.
+
+    The probes are sent concurrently so the server's layout extraction for
+    one overlaps the others; pass ``--serial`` to send them one at a time.
+    """
     print("🔍 Testing find_elements Performance")
     print("=" * 40)
 
@@ -35,85 +79,26 @@ async def test_find_elements_performance():
                 await session.initialize()
                 print("✅ Connected to MCP server")
 
-                # Test 1: Search for non-existent element
-                print("\n1. Testing search for non-existent element...")
-                start_time = time.time()
-
-                result = await session.call_tool(
-                    name="find_elements",
-                    arguments={
-                        "text": "NonExistentButton123456",
-                        "exact_match": True
-                    }
-                )
-
-                end_time = time.time()
-                duration = end_time - start_time
-
-                if result.content and result.content[0].text:
-                    response = json.loads(result.content[0].text)
-                    if response.get("success"):
-                        count = response.get("count", 0)
-                        print(f"✅ Found {count} elements in {duration:.2f} seconds")
-                        if count == 0:
-                            print(f"   🎯 Empty result returned in {duration:.2f}s")
-                            if duration > 1.0:
-                                print(f"   ⚠️  Took longer than expected for empty result")
-                    else:
-                        print(f"❌ Failed: {response.get('error')}")
-                        print(f"   Duration: {duration:.2f} seconds")
+                start_time = time.perf_counter()
+                if serial:
+                    results = [
+                        await timed_call(session, arguments)
+                        for _, arguments in PROBES
+                    ]
                 else:
-                    print(f"❌ No response content, duration: {duration:.2f} seconds")
-
-                # Test 2: Search for multiple non-existent criteria
-                print("\n2. Testing multiple non-existent search criteria...")
-                start_time = time.time()
-
-                result = await session.call_tool(
-                    name="find_elements",
-                    arguments={
-                        "text": "NonExistent",
-                        "resource_id": "com.fake.app:id/fake_button",
-                        "content_desc": "Fake description that does not exist"
-                    }
-                )
-
-                end_time = time.time()
-                duration = end_time - start_time
-
-                if result.content and result.content[0].text:
-                    response = json.loads(result.content[0].text)
-                    if response.get("success"):
-                        count = response.get("count", 0)
-                        print(f"✅ Found {count} elements in {duration:.2f} seconds")
-                    else:
-                        print(f"❌ Failed: {response.get('error')}")
-                        print(f"   Duration: {duration:.2f} seconds")
-
-                # Test 3: Search with class_name only
-                print("\n3. Testing class_name search (potentially slower)...")
-                start_time = time.time()
-
-                result = await session.call_tool(
-                    name="find_elements",
-                    arguments={
-                        "class_name": "android.widget.NonExistentWidget"
-                    }
-                )
-
-                end_time = time.time()
-                duration = end_time - start_time
-
-                if result.content and result.content[0].text:
-                    response = json.loads(result.content[0].text)
-                    if response.get("success"):
-                        count = response.get("count", 0)
-                        print(f"✅ Found {count} elements in {duration:.2f} seconds")
-                    else:
-                        print(f"❌ Failed: {response.get('error')}")
-                        print(f"   Duration: {duration:.2f} seconds")
+                    results = await asyncio.gather(
+                        *(timed_call(session, arguments) for _, arguments in PROBES)
+                    )
+                total = time.perf_counter() - start_time
+
+                for index, ((description, _), (result, duration)) in enumerate(
+                    zip(PROBES, results), start=1
+                ):
+                    report(index, description, result, duration)
 
                 print(f"\n📊 Performance Summary:")
+                mode = "serially" if serial else "concurrently"
+                print(f"- {len(PROBES)} searches sent {mode} in {total:.2f} seconds")
                 print(f"- All searches should complete quickly for empty results")
                 print(f"- UI layout extraction is the main time factor")
                 print(f"- Current timeout setting: 5 seconds")
@@ -123,4 +108,4 @@ async def test_find_elements_performance():
 
 
 if __name__ == "__main__":
-    asyncio.run(test_find_elements_performance())
\ No newline at end of file
+    asyncio.run(test_find_elements_performance(serial="--serial" in sys.argv))
@@ -3,18 +3,14 @@
 
 import asyncio
 import json
-import subprocess
-import sys
 import time
 from pathlib import Path
 
-try:
-    from mcp import ClientSession, StdioServerParameters
-    from mcp.client.stdio import stdio_client
-except ImportError:
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "mcp"])
-    from mcp import ClientSession, StdioServerParameters
-    from mcp.client.stdio import stdio_client
+from _mcp_bootstrap import ensure_mcp
+
+ensure_mcp()
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
 
 
 async def test_find_empty():
@@ -32,12 +28,12 @@ async def test_find_empty():
             print("Connected to server")
 
             # Test empty search
-            start = time.time()
+            start = time.perf_counter()
             result = await session.call_tool(
                 name="find_elements",
                 arguments={"text": "NonExistentElement12345"}
             )
-            duration = time.time() - start
+            duration = time.perf_counter() - start
 
             if result.content:
                 response = json.loads(result.content[0].text)
@@ -3,17 +3,13 @@
 
 import asyncio
 import json
-import subprocess
-import sys
 import time
 
-try:
-    from mcp import ClientSession, StdioServerParameters
-    from mcp.client.stdio import stdio_client
-except ImportError:
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "mcp"])
-    from mcp import ClientSession, StdioServerParameters
-    from mcp.client.stdio import stdio_client
+from _mcp_bootstrap import ensure_mcp
+
+ensure_mcp()
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
 
 
 async def test_find_elements():
@@ -32,7 +28,7 @@ async def test_find_elements():
                 print("Connected to server")
 
                 # Test find_elements
-                start = time.time()
+                start = time.perf_counter()
                 result = await session.call_tool(
                     name="find_elements",
                     arguments={
@@ -44,7 +40,7 @@ async def test_find_elements():
                         }
                     }
                 )
-                duration = time.time() - start
+                duration = time.perf_counter() - start
 
                 print(f"Duration: {duration:.2f}s")
                 print(f"Result content type: {type(result.content)}")
@@ -6,19 +6,13 @@ This script acts as an MCP client to test the server's logcat tools.
 
 import asyncio
 import json
-import subprocess
-import sys
 from pathlib import Path
 
-# Try to import MCP client - install if needed
-try:
-    from mcp import ClientSession, StdioServerParameters
-    from mcp.client.stdio import stdio_client
-except ImportError:
-    print("❌ MCP client not found. Installing...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "mcp"])
-    from mcp import ClientSession, StdioServerParameters
-    from mcp.client.stdio import stdio_client
+from _mcp_bootstrap import ensure_mcp
+
+ensure_mcp()
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
 
 
 async def test_logcat_via_mcp():
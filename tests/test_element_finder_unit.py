@@ -1,6 +1,6 @@
 """Unit tests for ElementFinder core logic.
 
-Tests _find_in_elements_recursive, _element_matches_criteria, get_element_center,
+Tests find_elements matching, _element_matches_criteria, get_element_center,
 element_to_dict, and find_best_element scoring without going through the full
 async UI extraction pipeline.
 """
@@ -222,8 +222,9 @@ class TestElementMatchesCriteria:
             clickable="true",
             **{"class": "android.widget.Button", "resource-id": "com.app:id/submit"},
         )
+        # Partial-match needles arrive pre-lowercased from the search loop.
         assert finder._element_matches_criteria(
-            elem, "Submit", "submit", "Button", None, True, False, False, False
+            elem, "submit", "submit", "button", None, True, False, False, False
         )
 
     def test_multiple_criteria_one_fails(self):
@@ -262,67 +263,108 @@ class TestElementMatchesCriteria:
             elem, None, None, None, None, False, False, True, False
         )
 
+    # -- empty needles --
+
+    def test_empty_needle_matches_anything_when_partial(self):
+        finder = _make_finder()
+        elem = _make_element(text="Hello")
+        assert finder._element_matches_criteria(
+            elem, "", "", "", "", False, False, False, False
+        )
+
+    def test_empty_needle_requires_empty_value_when_exact(self):
+        finder = _make_finder()
+        elem = _make_element(text="Hello")
+        assert not finder._element_matches_criteria(
+            elem, "", None, None, None, False, False, False, True
+        )
+        assert finder._element_matches_criteria(
+            _make_element(text=""), "", None, None, None, False, False, False, True
+        )
+
 
 # ---------------------------------------------------------------------------
-# _find_in_elements_recursive
+# find_elements scanning (partial and exact paths)
 # ---------------------------------------------------------------------------
 
-class TestFindInElementsRecursive:
-    """Direct tests for the recursive traversal function."""
+def _finder_with(*elements):
+    """Create an ElementFinder whose layout holds ``elements``."""
+    finder = _make_finder()
+    finder.ui_extractor.get_ui_layout.return_value = {
+        "success": True,
+        "elements": list(elements),
+        "element_count": len(elements),
+    }
+    return finder
 
-    def test_empty_list(self):
-        finder = _make_finder()
-        matches = []
-        finder._find_in_elements_recursive(
-            [], matches, None, None, None, None, False, False, False, False
-        )
-        assert matches == []
 
-    def test_single_match(self):
-        finder = _make_finder()
-        elements = [_make_element(text="Hello")]
-        matches = []
-        finder._find_in_elements_recursive(
-            elements, matches, "Hello", None, None, None, False, False, False, True
+class TestFindElementsScan:
+    """Matching through find_elements over a flat element list."""
+
+    @pytest.mark.asyncio
+    async def test_single_exact_match(self):
+        finder = _finder_with(_make_element(text="Hello"))
+        matches = await finder.find_elements(
+            text="Hello", enabled_only=False, exact_match=True, device_id="d"
         )
         assert len(matches) == 1
         assert matches[0]["text"] == "Hello"
 
-    def test_no_match(self):
-        finder = _make_finder()
-        elements = [_make_element(text="Hello")]
-        matches = []
-        finder._find_in_elements_recursive(
-            elements, matches, "Goodbye", None, None, None, False, False, False, True
+    @pytest.mark.asyncio
+    async def test_no_exact_match(self):
+        finder = _finder_with(_make_element(text="Hello"))
+        matches = await finder.find_elements(
+            text="Goodbye", enabled_only=False, exact_match=True, device_id="d"
         )
         assert matches == []
 
-    def test_multiple_matches_in_flat_list(self):
-        finder = _make_finder()
-        elements = [
+    @pytest.mark.asyncio
+    async def test_multiple_matches_in_flat_list(self):
+        finder = _finder_with(
             _make_element(text="Item 1"),
             _make_element(text="Something else"),
             _make_element(text="Item 2"),
             _make_element(text="Item 3"),
-        ]
-        matches = []
-        finder._find_in_elements_recursive(
-            elements, matches, "Item", None, None, None, False, False, False, False
         )
-        assert len(matches) == 3
+        matches = await finder.find_elements(text="Item", enabled_only=False, device_id="d")
+        assert [m["text"] for m in matches] == ["Item 1", "Item 2", "Item 3"]
 
-    def test_appends_to_existing_matches(self):
-        """Verify matches list is accumulated, not replaced."""
-        finder = _make_finder()
-        existing = [_make_element(text="pre-existing")]
-        elements = [_make_element(text="new")]
-        finder._find_in_elements_recursive(
-            elements, existing, "new", None, None, None, False, False, False, False
+    @pytest.mark.asyncio
+    async def test_partial_needles_lowercased_once_by_search(self):
+        element = _make_element(text="LOGIN", **{"class": "android.widget.Button"})
+        finder = _finder_with(element)
+        matches = await finder.find_elements(
+            text="Login", class_name="BUTTON", enabled_only=False, device_id="d"
         )
-        assert len(existing) == 2
+        assert matches == [element]
 
-    def test_all_filters_combined(self):
-        finder = _make_finder()
+    @pytest.mark.asyncio
+    async def test_exact_first_only_returns_one(self):
+        finder = _finder_with(_make_element(text="Go"), _make_element(text="Go"))
+        matches = await finder.find_elements(
+            text="Go", exact_match=True, first_only=True, device_id="d"
+        )
+        assert len(matches) == 1
+
+    @pytest.mark.asyncio
+    async def test_exact_first_only_stops_scanning(self, monkeypatch):
+        finder = _finder_with(*(_make_element(text="Go") for _ in range(5)))
+        checks = []
+        original = finder._element_matches_criteria
+
+        def counting(element, *args):
+            checks.append(element)
+            return original(element, *args)
+
+        monkeypatch.setattr(finder, "_element_matches_criteria", counting)
+        matches = await finder.find_elements(
+            text="Go", exact_match=True, first_only=True, device_id="d"
+        )
+        assert len(matches) == 1
+        assert len(checks) == 1
+
+    @pytest.mark.asyncio
+    async def test_all_filters_combined(self):
         good = _make_element(
             text="OK",
             clickable="true",
@@ -333,14 +375,12 @@ class TestFindInElementsRecursive:
         )
         bad_disabled = _make_element(text="OK", enabled="false", clickable="true", scrollable="true")
         bad_text = _make_element(text="Cancel", clickable="true", enabled="true", scrollable="true")
-        elements = [good, bad_disabled, bad_text]
-        matches = []
-        finder._find_in_elements_recursive(
-            elements, matches, "OK", "ok", "Button", "Confirm",
-            True, True, True, False
+        finder = _finder_with(good, bad_disabled, bad_text)
+        matches = await finder.find_elements(
+            text="OK", resource_id="ok", class_name="Button", content_desc="Confirm",
+            clickable_only=True, enabled_only=True, scrollable_only=True, device_id="d",
         )
-        assert len(matches) == 1
-        assert matches[0] is good
+        assert matches == [good]
 
 
 # ---------------------------------------------------------------------------
@@ -421,6 +461,14 @@ class TestElementToDict:
         assert result["scrollable"] == "false"
         assert result["displayed"] == "true"
 
+    def test_returns_copy_with_extra_keys(self):
+        finder = _make_finder()
+        elem = {"text": "Hello", "xpath": "//node[1]"}
+        result = finder.element_to_dict(elem)
+        assert result["xpath"] == "//node[1]"
+        result["text"] = "changed"
+        assert elem == {"text": "Hello", "xpath": "//node[1]"}
+
     def test_empty_element(self):
         finder = _make_finder()
         result = finder.element_to_dict({})
@@ -570,6 +618,19 @@ class TestFindBestElement:
         result = await finder.find_best_element(text="A", device_id="test-device")
         assert result["bounds"] == "[0,0][200,200]"
 
+    @pytest.mark.asyncio
+    async def test_tie_goes_to_first_element(self):
+        finder = _make_finder()
+        first = _make_element(text="Tie", **{"resource-id": "first"})
+        second = _make_element(text="Tie", **{"resource-id": "second"})
+        finder.ui_extractor.get_ui_layout.return_value = {
+            "success": True,
+            "elements": [first, second],
+            "element_count": 2,
+        }
+        result = await finder.find_best_element(text="tie", device_id="test-device")
+        assert result is first
+
     @pytest.mark.asyncio
     async def test_handles_exception(self):
         finder = _make_finder()
@@ -578,6 +639,183 @@ class TestFindBestElement:
         assert result is None
 
 
+# ---------------------------------------------------------------------------
+# layout cache
+# ---------------------------------------------------------------------------
+
+class TestLayoutCache:
+
+    def _layout(self, *elements):
+        return {"success": True, "elements": list(elements), "element_count": len(elements)}
+
+    @pytest.mark.asyncio
+    async def test_back_to_back_lookups_share_one_dump(self):
+        finder = _make_finder()
+        finder.ui_extractor.get_ui_layout.return_value = self._layout(
+            _make_element(text="OK", **{"resource-id": "com.app:id/ok"})
+        )
+        assert await finder.find_element_by_text("OK", device_id="test-device")
+        assert await finder.find_element_by_id("com.app:id/ok", device_id="test-device")
+        assert await finder.find_best_element(text="OK", device_id="test-device")
+        assert finder.ui_extractor.get_ui_layout.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_is_per_device_and_expires(self):
+        finder = _make_finder()
+        finder.ui_extractor.get_ui_layout.return_value = self._layout(_make_element(text="OK"))
+        await finder.find_elements(text="OK", device_id="a")
+        await finder.find_elements(text="OK", device_id="b")
+        assert finder.ui_extractor.get_ui_layout.await_count == 2
+
+        finder._layout_ttl = 0
+        await finder.find_elements(text="OK", device_id="a")
+        assert finder.ui_extractor.get_ui_layout.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_fresh_dump(self):
+        finder = _make_finder()
+        finder.ui_extractor.get_ui_layout.return_value = self._layout(_make_element(text="Old"))
+        assert await finder.find_elements(text="Old", device_id="test-device")
+
+        finder.ui_extractor.get_ui_layout.return_value = self._layout(_make_element(text="New"))
+        finder.invalidate_layout_cache("test-device")
+        assert await finder.find_elements(text="New", device_id="test-device")
+        assert finder.ui_extractor.get_ui_layout.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_exact_id_lookup_uses_index_and_filters(self):
+        finder = _make_finder()
+        first = _make_element(text="A", clickable="false", **{"resource-id": "com.app:id/btn"})
+        other = _make_element(text="B", clickable="true", **{"resource-id": "com.app:id/other"})
+        second = _make_element(text="C", clickable="true", **{"resource-id": "com.app:id/btn"})
+        finder.ui_extractor.get_ui_layout.return_value = self._layout(first, other, second)
+
+        result = await finder.find_elements(
+            resource_id="com.app:id/btn", exact_match=True, device_id="test-device"
+        )
+        assert result == [first, second]
+
+        result = await finder.find_elements(
+            resource_id="com.app:id/btn", clickable_only=True, exact_match=True,
+            device_id="test-device",
+        )
+        assert result == [second]
+
+        snapshot = finder._layout_cache["test-device"]
+        assert snapshot.by_resource_id["com.app:id/btn"] == [first, second]
+        assert await finder.find_elements(
+            class_name="missing", exact_match=True, device_id="test-device"
+        ) == []
+
+    @pytest.mark.asyncio
+    async def test_state_columns_prefilter_like_matcher(self):
+        finder = _make_finder()
+        plain = {"text": "Go"}  # missing flags use the matcher's defaults
+        disabled = _make_element(text="Go", enabled="false", clickable="true")
+        clickable = _make_element(text="Go", clickable="true")
+        scroller = _make_element(text="Go", scrollable="true")
+        finder.ui_extractor.get_ui_layout.return_value = self._layout(
+            plain, disabled, clickable, scroller
+        )
+
+        assert await finder.find_elements(text="go", device_id="d") == [
+            plain, clickable, scroller
+        ]
+        assert await finder.find_elements(
+            text="go", clickable_only=True, device_id="d"
+        ) == [clickable]
+        assert await finder.find_elements(
+            text="go", scrollable_only=True, enabled_only=False, device_id="d"
+        ) == [scroller]
+        assert await finder.find_elements(
+            clickable_only=True, enabled_only=False, device_id="d"
+        ) == [disabled, clickable]
+        assert finder.ui_extractor.get_ui_layout.await_count == 1
+        # bit 0 clickable, bit 1 enabled, bit 2 scrollable
+        assert finder._layout_cache["d"].flags == [0b010, 0b001, 0b011, 0b110]
+
+    @pytest.mark.asyncio
+    async def test_base_score_computed_lazily_once_per_snapshot(self):
+        finder = _make_finder()
+        finder.ui_extractor.get_ui_layout.return_value = self._layout(
+            _make_element(text="A", bounds="[0,0][200,200]"),
+            _make_element(text="A", bounds="[0,0][200,50]"),
+            {"text": "A"},
+            _make_element(text="A", bounds="garbage"),
+        )
+        await finder.find_elements(text="A", device_id="d")
+        # Plain lookups never score, so bounds aren't parsed for them
+        assert "base_score" not in vars(finder._layout_cache["d"])
+        await finder.find_best_element(text="A", device_id="d")
+        # enabled (+2) plus the size bonus where bounds exceed 100x100
+        assert finder._layout_cache["d"].base_score == [3, 2, 0, 2]
+
+    @pytest.mark.asyncio
+    async def test_one_shot_lookup_builds_no_columns(self):
+        finder = _make_finder()
+        ok = _make_element(text="OK", **{"resource-id": "id/ok"})
+        other = _make_element(text="Other")
+        finder.ui_extractor.get_ui_layout.return_value = self._layout(ok, other)
+
+        assert await finder.find_elements(
+            resource_id="id/ok", exact_match=True, device_id="d"
+        ) == [ok]
+        snapshot = finder._layout_cache["d"]
+        assert snapshot.queried
+        assert not {"by_resource_id", "flags", "texts_lower"} & set(vars(snapshot))
+
+        # A second query against the same snapshot switches to the index
+        assert await finder.find_elements(
+            resource_id="id/ok", text="OK", exact_match=True, device_id="d"
+        ) == [ok]
+        assert "by_resource_id" in vars(snapshot)
+
+    @pytest.mark.asyncio
+    async def test_lowercased_columns_built_on_demand_and_reused(self):
+        finder = _make_finder()
+        button = _make_element(text="Sign In", **{"class": "android.widget.Button"})
+        label = _make_element(text="Welcome", **{"class": "android.widget.TextView"})
+        finder.ui_extractor.get_ui_layout.return_value = self._layout(button, label)
+
+        assert await finder.find_elements(text="SIGN", device_id="d") == [button]
+        snapshot = finder._layout_cache["d"]
+        assert snapshot.texts_lower == ["sign in", "welcome"]
+        assert "classes_lower" not in vars(snapshot)
+
+        assert await finder.find_elements(
+            text="e", class_name="TEXTVIEW", device_id="d"
+        ) == [label]
+        assert snapshot.classes_lower == ["android.widget.button", "android.widget.textview"]
+
+    @pytest.mark.asyncio
+    async def test_repeated_queries_memoized_per_snapshot(self):
+        finder = _make_finder()
+        ok = _make_element(text="OK", clickable="true")
+        finder.ui_extractor.get_ui_layout.return_value = self._layout(ok)
+
+        first = await finder.find_elements(text="OK", device_id="d")
+        first.clear()  # callers get their own list
+        assert await finder.find_elements(text="OK", device_id="d") == [ok]
+        assert len(finder._layout_cache["d"].found) == 1
+
+        assert await finder.find_best_element(text="OK", device_id="d") is ok
+        assert await finder.find_best_element(text="missing", device_id="d") is None
+        assert await finder.find_best_element(text="missing", device_id="d") is None
+        assert len(finder._layout_cache["d"].best) == 2
+
+        finder.invalidate_layout_cache("d")
+        finder.ui_extractor.get_ui_layout.return_value = self._layout()
+        assert await finder.find_best_element(text="OK", device_id="d") is None
+
+    @pytest.mark.asyncio
+    async def test_failed_layout_not_cached(self):
+        finder = _make_finder()
+        finder.ui_extractor.get_ui_layout.return_value = {"success": False}
+        assert await finder.find_elements(text="x", device_id="test-device") == []
+        assert await finder.find_elements(text="x", device_id="test-device") == []
+        assert finder.ui_extractor.get_ui_layout.await_count == 2
+
+
 # ---------------------------------------------------------------------------
 # find_element_by_text / find_element_by_id
 # ---------------------------------------------------------------------------
@@ -599,6 +837,19 @@ class TestFindElementByTextAndId:
         assert result is not None
         assert result["text"] == "First"
 
+    @pytest.mark.asyncio
+    async def test_first_only_stops_at_first_match(self):
+        finder = _make_finder()
+        finder.ui_extractor.get_ui_layout.return_value = {
+            "success": True,
+            "elements": [_make_element(text="Go"), _make_element(text="Go again")],
+            "element_count": 2,
+        }
+        result = await finder.find_elements(text="go", device_id="test-device", first_only=True)
+        assert [e["text"] for e in result] == ["Go"]
+        result = await finder.find_elements(text="go", device_id="test-device")
+        assert len(result) == 2
+
     @pytest.mark.asyncio
     async def test_find_element_by_text_returns_none(self):
         finder = _make_finder()
@@ -676,15 +927,11 @@ class TestMalformedHierarchyHandling:
             elem, None, None, None, None, False, False, False, False
         )
 
-    def test_recursive_with_non_dict_elements(self):
-        """If elements list contains non-dict items, verify behavior."""
-        finder = _make_finder()
-        # This should not crash even with weird data
-        elements = [_make_element(text="valid")]
-        matches = []
-        finder._find_in_elements_recursive(
-            elements, matches, None, None, None, None, False, False, False, False
-        )
+    @pytest.mark.asyncio
+    async def test_find_elements_with_no_criteria(self):
+        """With no criteria every element matches."""
+        finder = _finder_with(_make_element(text="valid"))
+        matches = await finder.find_elements(enabled_only=False, device_id="d")
         assert len(matches) == 1
 
     @pytest.mark.asyncio
@@ -80,7 +80,6 @@ def mock_ui_element():
         scrollable=False,
         displayed=True,
         children=[],
-        xpath="//android.widget.Button[@resource-id='com.test:id/button']",
         index=0,
     )
 
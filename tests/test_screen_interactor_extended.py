@@ -101,6 +101,9 @@ class MockElementFinder:
         bounds = element.get("bounds", "[100,200][300,400]")
         return {"x": 200, "y": 300}  # Mock center
 
+    def invalidate_layout_cache(self, device_id=None) -> None:
+        pass
+
     def element_to_dict(self, element: Dict) -> Dict:
         return element
 
@@ -904,5 +907,44 @@ class TestPerformanceScenarios:
         assert len(results) == 20
 
 
+
+@pytest.mark.asyncio
+class TestLayoutCacheInvalidation:
+    """Every screen-changing action drops the finder's cached layout."""
+
+    @pytest.mark.parametrize(
+        "action, args",
+        [
+            ("tap_coordinates", (10, 20)),
+            ("long_press_coordinates", (10, 20)),
+            ("swipe_coordinates", (0, 0, 100, 100)),
+            ("input_text", ("hello",)),
+            ("press_key", ("BACK",)),
+            ("clear_text_field", ()),
+        ],
+    )
+    async def test_action_invalidates_layout(self, action, args):
+        interactor = ScreenInteractor(MockADBManager(), MockUIInspector())
+        interactor.element_finder = Mock()
+
+        await getattr(interactor, action)(*args, device_id="test-device")
+
+        interactor.element_finder.invalidate_layout_cache.assert_called_with(
+            "test-device"
+        )
+
+    async def test_failed_command_still_invalidates(self):
+        adb = MockADBManager()
+        adb.execute_adb_command = AsyncMock(side_effect=OSError("device gone"))
+        interactor = ScreenInteractor(adb, MockUIInspector())
+        interactor.element_finder = Mock()
+
+        result = await interactor.tap_coordinates(1, 2, device_id="test-device")
+
+        assert result["success"] is False
+        interactor.element_finder.invalidate_layout_cache.assert_called_once_with(
+            "test-device"
+        )
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -16,9 +16,11 @@ import asyncio
 import pytest
 from unittest.mock import MagicMock
 
+from src.tools import ui as ui_tools
 from src.tools.ui import (
     _is_meaningful_element,
     _parse_bounds_to_coordinates,
+    _transform_and_check,
     _transform_element_to_screen_format,
     find_elements,
     get_ui_layout,
@@ -27,14 +29,17 @@ from src.tools.ui import (
 )
 from src.tool_models import ElementSearchParams, UILayoutParams
 from src.registry import ComponentRegistry
+from src.screen_interactor import ScreenAutomation
 from src.validation import ValidationResult
 
 
 @pytest.fixture(autouse=True)
 def _clean_registry():
     ComponentRegistry.reset()
+    ui_tools._fg_cache.clear()
     yield
     ComponentRegistry.reset()
+    ui_tools._fg_cache.clear()
 
 
 # ---------------------------------------------------------------------------
@@ -144,6 +149,21 @@ class TestIsMeaningfulElement:
         assert _is_meaningful_element(element) is False
 
 
+class TestTransformAndCheck:
+    def test_meaningful_element_kept(self):
+        element = {"text": "OK", "bounds": "[0,0][100,50]"}
+        result = _transform_and_check(element)
+        assert result is not None
+        assert result["text"] == "OK"
+
+    def test_empty_element_dropped(self):
+        element = {"class": "android.view.View", "bounds": "[0,0][100,50]"}
+        assert _transform_and_check(element) is None
+
+    def test_zero_area_dropped(self):
+        assert _transform_and_check({"text": "OK", "bounds": "[0,0][0,0]"}) is None
+
+
 # ---------------------------------------------------------------------------
 # get_ui_layout
 # ---------------------------------------------------------------------------
@@ -181,6 +201,41 @@ class TestGetUiLayout:
         assert result["success"] is True
         assert result["elements"][0]["text"] == "OK"
 
+    @pytest.mark.asyncio
+    async def test_dict_elements_skip_finder(
+        self, mock_ui_inspector, mock_adb_manager, monkeypatch
+    ):
+        """All-dict dumps never construct an ElementFinder."""
+        ComponentRegistry.instance().register("ui_inspector", mock_ui_inspector)
+        ComponentRegistry.instance().register("adb_manager", mock_adb_manager)
+        finder_cls = MagicMock()
+        monkeypatch.setattr("src.tools.ui.ElementFinder", finder_cls)
+
+        result = await get_ui_layout(UILayoutParams())
+
+        assert result["success"] is True
+        finder_cls.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_non_dict_elements_converted(
+        self, mock_ui_inspector, mock_adb_manager, monkeypatch
+    ):
+        """Non-dict elements are converted through a single ElementFinder."""
+        ComponentRegistry.instance().register("ui_inspector", mock_ui_inspector)
+        ComponentRegistry.instance().register("adb_manager", mock_adb_manager)
+        mock_ui_inspector.get_ui_layout.return_value = {
+            "success": True,
+            "elements": [object(), object()],
+        }
+        finder_cls = MagicMock()
+        finder_cls.return_value.element_to_dict.return_value = {"text": "X"}
+        monkeypatch.setattr("src.tools.ui.ElementFinder", finder_cls)
+
+        result = await get_ui_layout(UILayoutParams())
+
+        assert result["elements"] == [{"text": "X"}, {"text": "X"}]
+        finder_cls.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_failed_layout(self, mock_ui_inspector, mock_adb_manager):
         """If inspector returns success=False, propagate as-is."""
@@ -311,6 +366,42 @@ class TestListScreenElements:
         assert result["success"] is False
         assert "fg crash" in result["error"]
 
+    @pytest.mark.asyncio
+    async def test_foreground_app_cached_between_calls(
+        self, mock_ui_inspector, mock_adb_manager
+    ):
+        """Back-to-back calls on the same device reuse the Chrome check."""
+        reg = ComponentRegistry.instance()
+        reg.register("ui_inspector", mock_ui_inspector)
+        reg.register("adb_manager", mock_adb_manager)
+        mock_adb_manager.get_foreground_app.return_value = {
+            "success": True,
+            "package": "com.example.app",
+        }
+
+        await list_screen_elements()
+        await list_screen_elements()
+
+        mock_adb_manager.get_foreground_app.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_foreground_app_cache_expires(
+        self, mock_ui_inspector, mock_adb_manager, monkeypatch
+    ):
+        reg = ComponentRegistry.instance()
+        reg.register("ui_inspector", mock_ui_inspector)
+        reg.register("adb_manager", mock_adb_manager)
+        mock_adb_manager.get_foreground_app.return_value = {
+            "success": True,
+            "package": "com.example.app",
+        }
+
+        await list_screen_elements()
+        monkeypatch.setattr(ui_tools, "_FOREGROUND_CACHE_TTL", 0.0)
+        await list_screen_elements()
+
+        assert mock_adb_manager.get_foreground_app.await_count == 2
+
     @pytest.mark.asyncio
     async def test_chrome_timeout_returns_failure(
         self, mock_ui_inspector, mock_adb_manager
@@ -382,6 +473,25 @@ class TestFindElements:
         assert "elements" in result
         assert "execution_time" in result
 
+    @pytest.mark.asyncio
+    async def test_reuses_screen_automation_finder(
+        self, mock_ui_inspector, mock_validator, mock_adb_manager
+    ):
+        """Searches share the registered finder's layout cache across calls."""
+        reg = ComponentRegistry.instance()
+        reg.register("ui_inspector", mock_ui_inspector)
+        reg.register("adb_manager", mock_adb_manager)
+        reg.register("validator", mock_validator)
+        reg.register(
+            "screen_automation", ScreenAutomation(mock_adb_manager, mock_ui_inspector)
+        )
+
+        params = ElementSearchParams(text="Login")
+        await find_elements(params)
+        await find_elements(params)
+
+        mock_ui_inspector.get_ui_layout.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_validation_failure(self, mock_ui_inspector, mock_validator, mock_adb_manager):
         reg = ComponentRegistry.instance()
@@ -446,7 +556,7 @@ class TestRegisterUiTools:
 
 @pytest.mark.asyncio
 async def test_device_switch_midflight_ui_layout():
-    """get_ui_layout is a multi-step flow (dump → test -f → cat) — every
+    """get_ui_layout is a multi-step flow (dump → cat) — every
     step must target the device id that was snapshotted at entry even if
     ``selected_device`` is mutated between steps.
     """
@@ -1,13 +1,16 @@
 """Tests for UI Inspector and Element Finder functionality."""
 
 import asyncio
+import dataclasses
+import threading
 import xml.etree.ElementTree as ET
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from src.ui_inspector import ElementFinder, UILayoutExtractor
-from src.ui_models import parse_bounds
+from src.ui_inspector import ElementFinder, UILayoutExtractor, UIParser
+from src.ui_models import parse_bounds, parse_bounds_canonical
+from src.ui_parser import clean_xml_content
 from tests.mocks import MockErrorScenarios, MockUIScenarios
 
 
@@ -181,6 +184,46 @@ class TestUILayoutExtractor:
             # Should handle gracefully, either return None or default values
             assert parsed is None or isinstance(parsed, dict)
 
+    def test_parse_bounds_normalizes_fast_and_lenient_paths(self):
+        """Inverted and negative bounds are fixed up on both parse paths."""
+        expected = {"left": 0, "top": 20, "right": 300, "bottom": 400}
+        assert parse_bounds("[300,400][-10,20]") == expected
+        assert parse_bounds("[ 300, 400][-10 ,20 ]") == expected
+
+    def test_parse_bounds_warns_once_on_large_coordinates(self, caplog):
+        from src.ui_models import _parse_bounds_record
+
+        _parse_bounds_record.cache_clear()
+        with caplog.at_level("WARNING", logger="src.ui_models"):
+            parse_bounds("[0,0][20000,100]")
+            parse_bounds("[0,0][20000,100]")
+
+        warnings = [r for r in caplog.records if "Unusually large" in r.message]
+        assert len(warnings) == 1
+
+    def test_parse_bounds_canonical_reuses_clean_input(self):
+        raw = "[10,20][30,40]"
+        bounds, text = parse_bounds_canonical(raw)
+
+        assert text is raw
+        assert bounds == {"left": 10, "top": 20, "right": 30, "bottom": 40}
+        # Fixed-up bounds are re-serialized from the corrected values.
+        assert parse_bounds_canonical("[30,40][-10,20]")[1] == "[0,20][30,40]"
+        assert parse_bounds_canonical("bogus")[1] == "[0,0][0,0]"
+
+    def test_parse_bounds_cached_results_are_independent(self):
+        from src.ui_models import _parse_bounds_record
+
+        _parse_bounds_record.cache_clear()
+        first = parse_bounds("[1,2][3,4]")
+        first["left"] = 99
+        second = parse_bounds("[1,2][3,4]")
+
+        assert second["left"] == 1
+        assert _parse_bounds_record.cache_info().hits == 1
+        # Unhashable input bypasses the cache and still degrades to zeros.
+        assert parse_bounds({"left": 1}) == {"left": 0, "top": 0, "right": 0, "bottom": 0}
+
     @pytest.mark.asyncio
     async def test_ui_layout_caching(self, mock_adb_manager):
         """Test UI layout caching functionality."""
@@ -207,6 +250,91 @@ class TestUILayoutExtractor:
         # Implementation-dependent: may or may not use caching
         # This test ensures both calls work correctly
 
+    @pytest.mark.asyncio
+    async def test_identical_dump_reuses_parse(self, mock_adb_manager):
+        """An unchanged dump is served from the parse cache."""
+        ui_extractor = UILayoutExtractor(mock_adb_manager)
+
+        with patch.object(
+            ui_extractor._parser, "parse_safe", wraps=ui_extractor._parser.parse_safe
+        ) as parse_spy:
+            result1 = await ui_extractor.get_ui_layout(device_id="emulator-5554")
+            result2 = await ui_extractor.get_ui_layout(device_id="emulator-5554")
+            await ui_extractor.get_ui_layout(
+                include_invisible=True, device_id="emulator-5554"
+            )
+
+        # include_invisible changes the result, so it is a separate entry.
+        assert parse_spy.call_count == 2
+        assert result2["elements"] == result1["elements"]
+        assert result2["elements"] is not result1["elements"]
+        assert result2["stats"] == result1["stats"]
+
+    @pytest.mark.asyncio
+    async def test_cached_parse_elements_not_shared(self, mock_adb_manager):
+        """Mutating returned element dicts never corrupts the parse cache."""
+        ui_extractor = UILayoutExtractor(mock_adb_manager)
+
+        first = await ui_extractor.get_ui_layout(device_id="emulator-5554")
+        pristine = [dict(e) for e in first["elements"]]
+        for element in first["elements"]:
+            element["text"] = "annotated"
+            element["extra"] = True
+        second = await ui_extractor.get_ui_layout(device_id="emulator-5554")
+
+        assert second["elements"] == pristine
+
+    @pytest.mark.asyncio
+    async def test_hierarchy_available_from_cached_parse(self, mock_adb_manager):
+        """include_hierarchy works when the layout is served from the cache."""
+        ui_extractor = UILayoutExtractor(mock_adb_manager)
+
+        plain = await ui_extractor.get_ui_layout(device_id="emulator-5554")
+        with_tree = await ui_extractor.get_ui_layout(
+            device_id="emulator-5554", include_hierarchy=True
+        )
+
+        assert "hierarchy" not in plain
+        assert with_tree["hierarchy"]["children"]
+
+    @pytest.mark.asyncio
+    async def test_parse_runs_off_event_loop_thread(self, mock_adb_manager):
+        """Parsing is offloaded so the event loop keeps serving adb I/O."""
+        ui_extractor = UILayoutExtractor(mock_adb_manager)
+        parse_threads = []
+        real_parse = ui_extractor._parser.parse_safe
+
+        def recording_parse(*args, **kwargs):
+            parse_threads.append(threading.get_ident())
+            return real_parse(*args, **kwargs)
+
+        with patch.object(ui_extractor._parser, "parse_safe", side_effect=recording_parse):
+            result = await ui_extractor.get_ui_layout(device_id="emulator-5554")
+
+        assert result["success"] is True
+        assert parse_threads and threading.get_ident() not in parse_threads
+
+    @pytest.mark.asyncio
+    async def test_extractors_share_one_parse_pool(self, mock_adb_manager):
+        """Creating extractors does not add parse threads."""
+        parse_threads = set()
+
+        for _ in range(5):
+            extractor = UILayoutExtractor(mock_adb_manager)
+            real_parse = extractor._parser.parse_safe
+
+            def recording_parse(*args, _real=real_parse, **kwargs):
+                parse_threads.add(threading.current_thread().name)
+                return _real(*args, **kwargs)
+
+            with patch.object(extractor._parser, "parse_safe", side_effect=recording_parse):
+                await extractor._parse_xml_to_elements_safe(
+                    "<hierarchy><node /></hierarchy>"
+                )
+
+        assert len(parse_threads) <= 2
+        assert all(name.startswith("ui-parse") for name in parse_threads)
+
     @pytest.mark.asyncio
     async def test_ui_layout_with_malformed_xml(self, mock_adb_manager):
         """Test handling of malformed XML."""
@@ -227,10 +355,10 @@ class TestUILayoutExtractor:
 
     @pytest.mark.asyncio
     async def test_ui_layout_handles_disconnect_during_cat(self, mock_adb_manager):
-        """Device disconnects mid-sequence: dump ok, test -f ok, cat fails.
+        """Device disconnects mid-sequence: dump ok, cat fails.
 
-        The first two ADB calls (uiautomator dump, test -f) succeed. The third
-        call (cat /sdcard/window_dump.xml) fails with "device not found".
+        The first ADB call (uiautomator dump) succeeds. The second call
+        (cat /sdcard/window_dump.xml) fails with "device not found".
         get_ui_layout must return a graceful {success: False, error: ...}
         response without leaking a Python traceback.
         """
@@ -282,8 +410,8 @@ class TestUILayoutExtractor:
         assert isinstance(result, dict)
         assert result["success"] is False
         assert "error" in result
-        # Sanity: test -f and cat were actually attempted
-        assert any("test -f" in c for c in call_log)
+        # Sanity: cat was attempted directly, without a separate probe
+        assert not any("test -f" in c for c in call_log)
         assert any("cat " in c for c in call_log)
 
     @pytest.mark.asyncio
@@ -833,10 +961,10 @@ class TestUIInspectorErrorHandling:
 
 
 class TestUIStatsNoDoubleCount:
-    """Regression tests for T15: _calculate_stats must not double-count.
+    """Regression tests for T15: layout stats must not double-count.
 
-    The flat ``elements`` list already contains every descendant (built via
-    ``_add_children_to_main_list``), so stats must iterate the flat list
+    The flat ``elements`` list already contains every descendant (appended
+    once, in pre-order, by the parser), so stats must count the flat list
     without recursing into ``element.children``.
     """
 
@@ -1055,8 +1183,102 @@ class TestUIRetrieverRecoveryBranches:
         assert "recovery_attempts" in result
         assert len(result["recovery_attempts"]) == 1
         assert "Attempt 1" in result["recovery_attempts"][0]
-        # The 2nd attempt succeeded, so dump was called twice
-        assert call_counter["dump"] == 2
+        # The 2nd attempt succeeded: its streamed dump carried no XML (this
+        # mock cannot stream), so it fell back to the sdcard dump.
+        assert call_counter["dump"] == 3
+
+    @pytest.mark.asyncio
+    async def test_streamed_dump_skips_sdcard_file(self, mock_adb_manager):
+        """A dump streamed over exec-out is parsed without any file pull."""
+        mock_adb_manager.execute_adb_command.side_effect = None
+        valid_xml = self._valid_xml()
+        calls = []
+
+        async def scripted(cmd, *, device_id=None, timeout=30, **kwargs):
+            calls.append(cmd)
+            if "uiautomator dump /dev/tty" in cmd:
+                return {
+                    "success": True,
+                    "stdout": valid_xml + "UI hierchary dumped to: /dev/tty\n",
+                    "stderr": "",
+                    "return_code": 0,
+                }
+            return {"success": False, "stdout": "", "stderr": "unexpected", "return_code": 1}
+
+        mock_adb_manager.execute_adb_command.side_effect = scripted
+        extractor = UILayoutExtractor(mock_adb_manager)
+
+        result = await extractor.get_ui_layout(device_id="emulator-5554")
+
+        assert result["success"] is True
+        assert result["xml_dump"].endswith("</hierarchy>")
+        assert len(calls) == 1 and "exec-out" in calls[0]
+
+    @pytest.mark.asyncio
+    async def test_stream_unsupported_falls_back_once(self, mock_adb_manager):
+        """Devices that cannot stream are remembered and dump to sdcard."""
+        extractor = UILayoutExtractor(mock_adb_manager)
+
+        first = await extractor.get_ui_layout(device_id="emulator-5554")
+        mock_adb_manager.execute_adb_command.reset_mock()
+        second = await extractor.get_ui_layout(device_id="emulator-5554")
+
+        assert first["success"] is True and second["success"] is True
+        commands = [c.args[0] for c in mock_adb_manager.execute_adb_command.call_args_list]
+        assert not any("/dev/tty" in c for c in commands)
+
+    @pytest.mark.asyncio
+    async def test_transient_stream_error_is_not_remembered(self, mock_adb_manager):
+        """uiautomator hiccups fail the dump without disabling streaming."""
+        mock_adb_manager.execute_adb_command.side_effect = None
+        calls = []
+
+        async def scripted(cmd, *, device_id=None, timeout=30, **kwargs):
+            calls.append(cmd)
+            return {
+                "success": True,
+                "stdout": "ERROR: could not get idle state.\n",
+                "stderr": "",
+                "return_code": 0,
+            }
+
+        mock_adb_manager.execute_adb_command.side_effect = scripted
+        extractor = UILayoutExtractor(mock_adb_manager)
+
+        result = await extractor.get_ui_layout(
+            retry_on_failure=False, device_id="emulator-5554"
+        )
+
+        assert result["success"] is False
+        assert "could not get idle state" in result["error"]
+        assert calls == [calls[0]] and "/dev/tty" in calls[0]
+        assert "emulator-5554" not in extractor._no_stream_dump
+
+    @pytest.mark.asyncio
+    async def test_unrecognized_stream_output_remembered_after_repeats(
+        self, mock_adb_manager
+    ):
+        """Odd no-XML output falls back per dump until it keeps recurring."""
+        valid_xml = self._valid_xml()
+        mock_adb_manager.execute_adb_command.side_effect = None
+
+        async def scripted(cmd, *, device_id=None, timeout=30, **kwargs):
+            if "/dev/tty" in cmd:
+                stdout = "Killed\n"
+            elif "cat " in cmd:
+                stdout = valid_xml
+            else:
+                stdout = ""
+            return {"success": True, "stdout": stdout, "stderr": "", "return_code": 0}
+
+        mock_adb_manager.execute_adb_command.side_effect = scripted
+        extractor = UILayoutExtractor(mock_adb_manager)
+
+        for _ in range(2):
+            assert (await extractor.get_ui_layout(device_id="d"))["success"]
+            assert "d" not in extractor._no_stream_dump
+        assert (await extractor.get_ui_layout(device_id="d"))["success"]
+        assert "d" in extractor._no_stream_dump
 
     @pytest.mark.asyncio
     async def test_unexpected_exception_exhausts_retries(self, mock_adb_manager):
@@ -1081,25 +1303,24 @@ class TestUIRetrieverRecoveryBranches:
 
     @pytest.mark.asyncio
     async def test_pull_ui_dump_missing_file_then_none(self, mock_adb_manager):
-        """_pull_ui_dump_file_with_retry: test -f returns 'missing' on all
-        attempts -> returns None (lines 263-269). The outer get_ui_layout
-        then returns a failure dict referencing the missing file path.
+        """_pull_ui_dump_file_with_retry: cat reports a missing file on all
+        attempts -> returns None. The outer get_ui_layout then returns a
+        failure dict referencing the missing file path.
         """
         mock_adb_manager.execute_adb_command.side_effect = None
+        cat_calls = []
 
         async def scripted(cmd, *, device_id=None, timeout=30, **kwargs):
             if "uiautomator dump" in cmd:
                 return {"success": True, "stdout": "", "stderr": "", "return_code": 0}
-            if "test -f" in cmd:
+            if "cat " in cmd:
+                cat_calls.append(cmd)
                 return {
-                    "success": True,
-                    "stdout": "missing",
-                    "stderr": "",
-                    "return_code": 0,
+                    "success": False,
+                    "stdout": "",
+                    "stderr": "cat: /sdcard/window_dump.xml: No such file or directory",
+                    "return_code": 1,
                 }
-            if "cat " in cmd:
-                # should not be reached
-                return {"success": True, "stdout": "", "stderr": "", "return_code": 0}
             return {"success": True, "stdout": "", "stderr": "", "return_code": 0}
 
         mock_adb_manager.execute_adb_command.side_effect = scripted
@@ -1110,6 +1331,7 @@ class TestUIRetrieverRecoveryBranches:
             pulled = await extractor._pull_ui_dump_file_with_retry(device_id="emulator-5554")
 
         assert pulled is None
+        assert len(cat_calls) == 3
 
     @pytest.mark.asyncio
     async def test_pull_ui_dump_malformed_then_recovers(self, mock_adb_manager):
@@ -1160,83 +1382,42 @@ class TestUIRetrieverRecoveryBranches:
         assert cat_count["n"] >= 2
 
     @pytest.mark.asyncio
-    async def test_pull_ui_dump_exception_all_attempts(self, mock_adb_manager):
-        """_pull_ui_dump_file_with_retry: adb call raises every attempt -> None
-        (lines 304-307 except clause, then final return None).
-        """
-        mock_adb_manager.execute_adb_command.side_effect = RuntimeError("boom")
-
+    async def test_pull_ui_dump_reads_via_exec_out(self, mock_adb_manager):
+        """The dump is read with ``exec-out`` so no PTY rewrites the bytes."""
         extractor = UILayoutExtractor(mock_adb_manager)
-        with patch("src.ui_retriever.asyncio.sleep", new=AsyncMock(return_value=None)):
-            pulled = await extractor._pull_ui_dump_file_with_retry(max_attempts=2, device_id="emulator-5554")
-
-        assert pulled is None
 
-    @pytest.mark.asyncio
-    async def test_pull_ui_dump_file_legacy_success(self, mock_adb_manager):
-        """_pull_ui_dump_file (legacy, non-retry): returns stdout on success
-        (lines 228-238).
-        """
-        mock_adb_manager.execute_adb_command.side_effect = None
-        mock_adb_manager.execute_adb_command.return_value = {
-            "success": True,
-            "stdout": "<hierarchy><node/></hierarchy>",
-            "stderr": "",
-            "return_code": 0,
-        }
-
-        extractor = UILayoutExtractor(mock_adb_manager)
-        pulled = await extractor._pull_ui_dump_file(device_id="emulator-5554")
-
-        assert pulled == "<hierarchy><node/></hierarchy>"
-
-    @pytest.mark.asyncio
-    async def test_pull_ui_dump_file_legacy_failure_returns_none(
-        self, mock_adb_manager
-    ):
-        """_pull_ui_dump_file (legacy): failed result returns None
-        (lines 240-241).
-        """
-        mock_adb_manager.execute_adb_command.side_effect = None
-        mock_adb_manager.execute_adb_command.return_value = {
-            "success": False,
-            "stdout": "",
-            "stderr": "no such file",
-            "return_code": 1,
-        }
-
-        extractor = UILayoutExtractor(mock_adb_manager)
-        pulled = await extractor._pull_ui_dump_file(device_id="emulator-5554")
+        pulled = await extractor._pull_ui_dump_file_with_retry(device_id="emulator-5554")
 
-        assert pulled is None
+        assert pulled is not None
+        commands = [c.args[0] for c in mock_adb_manager.execute_adb_command.call_args_list]
+        reads = [c for c in commands if "cat /sdcard/window_dump.xml" in c]
+        assert reads and all("exec-out cat" in c for c in reads)
 
     @pytest.mark.asyncio
-    async def test_pull_ui_dump_file_legacy_exception_returns_none(
-        self, mock_adb_manager
-    ):
-        """_pull_ui_dump_file (legacy): raised exception caught -> None
-        (lines 243-245).
+    async def test_pull_ui_dump_exception_all_attempts(self, mock_adb_manager):
+        """_pull_ui_dump_file_with_retry: adb call raises every attempt -> None
+        (lines 304-307 except clause, then final return None).
         """
         mock_adb_manager.execute_adb_command.side_effect = RuntimeError("boom")
 
         extractor = UILayoutExtractor(mock_adb_manager)
-        pulled = await extractor._pull_ui_dump_file(device_id="emulator-5554")
+        with patch("src.ui_retriever.asyncio.sleep", new=AsyncMock(return_value=None)):
+            pulled = await extractor._pull_ui_dump_file_with_retry(max_attempts=2, device_id="emulator-5554")
 
         assert pulled is None
 
-    @pytest.mark.asyncio
-    async def test_parse_xml_to_elements_direct(self, mock_adb_manager):
-        """_parse_xml_to_elements (line 318) delegates to the parser and
-        returns a list of UIElement objects.
+    def test_parse_sync_returns_parse_result(self, mock_adb_manager):
+        """_parse_sync is the blocking parse entry point used by the async
+        wrapper; it returns the parser's result dict with UIElement objects.
         """
         extractor = UILayoutExtractor(mock_adb_manager)
-        xml = self._valid_xml()
 
-        elements = await extractor._parse_xml_to_elements(xml)
+        result = extractor._parse_sync(self._valid_xml())
 
-        assert isinstance(elements, list)
+        assert result["success"] is True
         # valid_xml has at least a root hierarchy + one child node
-        assert len(elements) >= 1
+        assert len(result["elements"]) >= 1
+        assert result["stats"]["total_elements"] == len(result["elements"])
 
     @pytest.mark.asyncio
     async def test_extract_ui_hierarchy_failure_passes_error(self, mock_adb_manager):
@@ -1282,12 +1463,11 @@ class TestUIRetrieverRecoveryBranches:
         assert "simulated explosion" in result["error"]
 
     @pytest.mark.asyncio
-    async def test_extract_ui_hierarchy_success_builds_dict_from_dicts(
+    async def test_extract_ui_hierarchy_success_builds_tree(
         self, mock_adb_manager
     ):
-        """extract_ui_hierarchy happy path builds a dict-based hierarchy via
-        _build_hierarchy_dict_from_dicts (uses dict-shaped elements from
-        get_ui_layout).
+        """extract_ui_hierarchy happy path returns the real parsed tree: the
+        <hierarchy> root with its two <node> children.
         """
         xml = (
             '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
@@ -1322,17 +1502,19 @@ class TestUIRetrieverRecoveryBranches:
 
         assert result["success"] is True
         assert "hierarchy" in result
-        # hierarchy is a dict with class/bounds keys, per _build_hierarchy_dict_from_dicts
-        assert isinstance(result["hierarchy"], dict)
-        assert "class" in result["hierarchy"]
-        assert "children" in result["hierarchy"]
-        assert result["total_elements"] >= 1
+        hierarchy = result["hierarchy"]
+        assert hierarchy["class"] == ""  # the <hierarchy> root itself
+        assert [c["class"] for c in hierarchy["children"]] == [
+            "android.widget.FrameLayout",
+            "android.widget.Button",
+        ]
+        assert hierarchy["children"][1]["clickable"] is True
+        assert result["total_elements"] == 3
 
 
 class TestUIRetrieverHierarchyBuilders:
-    """Direct tests for the (currently-unused-by-happy-path) UIElement-based
-    hierarchy builders: _build_hierarchy_dict, _build_children_dict,
-    _build_hierarchy_dict_from_dicts.
+    """Direct tests for the UIElement-based hierarchy builders:
+    _build_hierarchy_dict, _build_children_dict.
     """
 
     def _make_element(
@@ -1360,7 +1542,6 @@ class TestUIRetrieverHierarchyBuilders:
             scrollable=False,
             displayed=True,
             children=children or [],
-            xpath="/node",
             index=0,
         )
 
@@ -1412,40 +1593,144 @@ class TestUIRetrieverHierarchyBuilders:
         # _build_children_dict only adds "children" when non-empty
         assert "children" not in second_child
 
-    def test_build_hierarchy_dict_from_dicts_empty(self, mock_adb_manager):
-        """_build_hierarchy_dict_from_dicts: empty list returns {} (line 407)."""
-        extractor = UILayoutExtractor(mock_adb_manager)
-        assert extractor._build_hierarchy_dict_from_dicts([]) == {}
 
-    def test_build_hierarchy_dict_from_dicts_single_element(self, mock_adb_manager):
-        """Single element: hierarchy reflects root fields, no children."""
-        extractor = UILayoutExtractor(mock_adb_manager)
-        root = {
-            "class": "android.widget.FrameLayout",
-            "resource-id": "r",
-            "text": "t",
-            "bounds": "[0,0][10,10]",
-        }
-        hierarchy = extractor._build_hierarchy_dict_from_dicts([root])
+class TestUIParserBackends:
+    """UIParser gives the same results with lxml and with ElementTree."""
+
+    XML = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<hierarchy rotation="0">'
+        "<!-- uiautomator comment -->"
+        '<node class="android.widget.FrameLayout" bounds="[0,0][100,100]">'
+        '<node class="android.widget.Button" text="Go" clickable="true" '
+        'bounds="[10,10][50,50]"/>'
+        "</node>"
+        "</hierarchy>"
+    )
+
+    @pytest.fixture(params=[True, False], ids=["lxml", "etree"])
+    def parser(self, request):
+        """UIParser pinned to each XML backend in turn."""
+        parser = UIParser()
+        if request.param:
+            pytest.importorskip("lxml")
+        else:
+            parser._use_lxml = False
+        return parser
 
-        assert hierarchy["class"] == "android.widget.FrameLayout"
-        assert hierarchy["resource-id"] == "r"
-        assert hierarchy["text"] == "t"
-        assert hierarchy["bounds"] == "[0,0][10,10]"
-        # Single element -> children is empty list
-        assert hierarchy["children"] == []
-
-    def test_build_hierarchy_dict_from_dicts_multiple(self, mock_adb_manager):
-        """Multiple dict elements: children slice contains all but first."""
-        extractor = UILayoutExtractor(mock_adb_manager)
-        elements = [
-            {"class": "A", "resource-id": "", "text": "", "bounds": ""},
-            {"class": "B", "resource-id": "", "text": "", "bounds": ""},
-            {"class": "C", "resource-id": "", "text": "", "bounds": ""},
+    def test_parse_safe_same_elements(self, parser):
+        result = parser.parse_safe(self.XML)
+
+        assert result["success"] is True
+        assert "warnings" not in result
+        # Comments are skipped: hierarchy + FrameLayout + Button.
+        assert [e.class_name for e in result["elements"]] == [
+            "",
+            "android.widget.FrameLayout",
+            "android.widget.Button",
         ]
-        hierarchy = extractor._build_hierarchy_dict_from_dicts(elements)
+        assert result["elements"][2].clickable is True
+        assert result["stats"] == {"total_elements": 3, "clickable_elements": 1}
 
-        assert hierarchy["class"] == "A"
-        assert len(hierarchy["children"]) == 2
-        assert hierarchy["children"][0]["class"] == "B"
-        assert hierarchy["children"][1]["class"] == "C"
+    def test_boolean_attributes_ignore_case(self, parser):
+        elements = parser.parse(
+            '<hierarchy><node class="A" bounds="[0,0][10,10]" clickable="tRue" '
+            'enabled="FALSE" focusable="True" scrollable="false"/></hierarchy>'
+        )
+
+        node = elements[-1]
+        assert node.clickable is True
+        assert node.enabled is False
+        assert node.focusable is True
+        assert node.scrollable is False
+
+    def test_parse_malformed_returns_empty(self, parser):
+        assert parser.parse("<hierarchy><node unclosed</hierarchy>") == []
+
+    @pytest.mark.parametrize(
+        "xml",
+        [
+            "<hierarchy><node unclosed</hierarchy>",
+            "<hierarchy><node></hierarchy>",
+            '<hierarchy><node text="a & b"/></hierarchy>',
+            "<hierarchy>",
+        ],
+    )
+    def test_malformed_input_fails_alike_on_both_backends(self, xml):
+        from src.ui_parser import _XML_PARSE_ERRORS
+
+        pytest.importorskip("lxml")
+        outcomes = []
+        for use_lxml in (True, False):
+            parser = UIParser()
+            parser._use_lxml = use_lxml
+            with pytest.raises(_XML_PARSE_ERRORS):
+                parser._build_elements(xml, include_invisible=False)
+            result = parser.parse_safe(xml)
+            outcomes.append((result["success"], result.get("warnings")))
+
+        # Both backends reject the input, and recover (or not) the same way
+        assert outcomes[0] == outcomes[1]
+
+    def test_streamed_parse_keeps_tree_and_skips_invisible(self, parser):
+        xml = (
+            "<hierarchy>"
+            '<node class="A"><node class="A1"/><node class="A2"/></node>'
+            '<node class="Hidden" displayed="false"><node class="H1"/></node>'
+            '<node class="B"/>'
+            "</hierarchy>"
+        )
+        elements = parser.parse(xml)
+
+        # Pre-order, each element exactly once, invisible subtree dropped.
+        assert [e.class_name for e in elements] == ["", "A", "A1", "A2", "B"]
+        root, a = elements[0], elements[1]
+        assert [c.class_name for c in root.children] == ["A", "B"]
+        assert [c.class_name for c in a.children] == ["A1", "A2"]
+        assert elements[-1].xpath == "/hierarchy[0]/node[2]"
+
+    def test_invisible_subtree_never_built(self, parser):
+        from src.ui_parser import _UIElementBuilder
+
+        xml = (
+            '<hierarchy><node class="Hidden" displayed="false">'
+            '<node class="H1"/><node class="H2"/></node></hierarchy>'
+        )
+
+        with patch.object(
+            _UIElementBuilder, "_build_element", autospec=True,
+            side_effect=_UIElementBuilder._build_element,
+        ) as build_spy:
+            elements = parser.parse(xml)
+
+        assert [e.class_name for e in elements] == [""]
+        assert build_spy.call_count == 1
+
+    def test_elements_compare_by_identity(self, parser):
+        xml = '<hierarchy><node class="X"/><node class="X"/></hierarchy>'
+        _, first, second = parser.parse(xml)
+
+        assert first.bounds == second.bounds and first.class_name == second.class_name
+        assert first != second
+        assert len({first, second}) == 2
+
+    def test_repeated_attribute_values_are_shared(self, parser):
+        node = '<node class="android.widget.TextView" resource-id="app:id/row"/>'
+
+        _, first, second = parser.parse(f"<hierarchy>{node}{node}</hierarchy>")
+
+        assert first.class_name is second.class_name
+        assert first.resource_id is second.resource_id
+
+    def test_elements_are_frozen(self, parser):
+        (root,) = parser.parse("<hierarchy/>")
+
+        assert not hasattr(root, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            root.text = "changed"
+
+
+def test_clean_xml_content_strips_only_illegal_control_chars():
+    dirty = '<node text="a\x00b\x01c\x7f" desc="t\tn\nr\r"/>'
+
+    assert clean_xml_content(dirty) == '<node text="abc" desc="t\tn\nr\r"/>'
@@ -1,5 +1,6 @@
 """Tests for input validation and sanitization system."""
 
+import logging
 from unittest.mock import Mock
 
 import pytest
@@ -45,6 +46,22 @@ class TestValidationResult:
         assert result.is_valid is True
         assert "Test warning" in result.warnings
 
+    def test_merge(self):
+        result = ValidationResult(True, warnings=["mine"])
+        result.merge(ValidationResult(True, warnings=["theirs"]))
+        assert result.is_valid is True
+        assert result.warnings == ["mine", "theirs"]
+
+        result.merge(ValidationResult(False, errors=["bad"]))
+        assert result.is_valid is False
+        assert result.errors == ["bad"]
+
+    def test_slots_instead_of_instance_dict(self):
+        result = ValidationResult(True)
+        assert not hasattr(result, "__dict__")
+        with pytest.raises(AttributeError):
+            result.extra = 1
+
 
 class TestCoordinateValidationViaPydantic:
     """Test coordinate validation via Pydantic models (unchanged)."""
@@ -97,6 +114,11 @@ class TestValidateCoordinate:
         result = ParameterValidator.validate_coordinate("10", 20)  # type: ignore[arg-type]
         assert not result.is_valid
 
+    def test_bounds_inclusive_and_bool_rejected(self):
+        assert ParameterValidator.validate_coordinate(50, 300, max_x=50, max_y=300).is_valid
+        result = ParameterValidator.validate_coordinate(True, 1)  # type: ignore[arg-type]
+        assert result.errors == ["x must be int, got bool"]
+
 
 class TestDeviceIdValidationViaPydantic:
     """Test device ID validation via Pydantic models."""
@@ -186,6 +208,40 @@ class TestValidateText:
             if result.is_valid:
                 assert len(result.warnings) > 0, f"Text '{text}' should have warnings"
 
+    def test_every_matching_injection_pattern_reported(self):
+        v = ParameterValidator(SecurityLevel.MODERATE)
+        result = v.validate_text("x; ls && whoami | cat")
+        reported = [w for w in result.warnings if "pattern detected" in w]
+        assert len(reported) == 3
+        assert any(r"&&\s*\w+" in w for w in reported)
+
+        clean = v.validate_text("plain words")
+        assert clean.warnings == []
+
+    def test_metacharacters_escaped_once_each(self):
+        v = ParameterValidator(SecurityLevel.MODERATE)
+        result = v.validate_text("a\\;b$")
+        assert result.sanitized_value == "a\\\\\\;b\\$"
+        assert "Escaped dangerous characters: $, ;, \\" in result.warnings
+
+    def test_plain_text_fast_path_matches_full_checks(self):
+        v = ParameterValidator(SecurityLevel.STRICT)
+        result = v.validate_text("user@example.com 42")
+        assert (result.is_valid, result.sanitized_value, result.warnings) == (
+            True, "user@example.com 42", []
+        )
+        # Characters outside the fast-path set still get the full checks
+        assert v.validate_text(" padded ").warnings
+        assert not v.validate_text("javascript:alert").is_valid
+
+    def test_repeat_validation_returns_independent_results(self):
+        v = ParameterValidator(SecurityLevel.MODERATE)
+        first = v.validate_text("a*b")
+        first.add_warning("caller note")
+        second = v.validate_text("a*b")
+        assert second.warnings == ["Escaped dangerous characters: *"]
+        assert second.sanitized_value == "a\\*b"
+
     def test_text_length_validation(self):
         long_text = "A" * 10000
         v = ParameterValidator(SecurityLevel.MODERATE)
@@ -240,6 +296,12 @@ class TestValidateKeycode:
         result = ParameterValidator.validate_keycode("999")
         assert result.is_valid is False
 
+    def test_names_normalized_with_or_without_prefix(self):
+        assert ParameterValidator.validate_keycode("back").sanitized_value == "BACK"
+        assert ParameterValidator.validate_keycode("keycode_back").sanitized_value == "KEYCODE_BACK"
+        assert ParameterValidator.validate_keycode("KEYCODE_66").is_valid is True
+        assert ParameterValidator.validate_keycode("KEYCODE_KEYCODE_BACK").is_valid is False
+
 
 class TestValidateFilename:
     """Test ParameterValidator.validate_filename (replaces FilePathValidator)."""
@@ -269,6 +331,15 @@ class TestValidateFilename:
         assert result.is_valid
         assert any("Reserved" in w for w in result.warnings)
 
+    @pytest.mark.parametrize(
+        "fn, reserved",
+        [("nul", True), ("sub/aux", True), ("com1.txt", True), ("LPT", True),
+         ("con.txt", False), ("console.log", False), ("com/shot.png", False)],
+    )
+    def test_reserved_names_match_basename(self, fn, reserved):
+        result = ParameterValidator.validate_filename(fn, allow_path=True)
+        assert any("Reserved" in w for w in result.warnings) is reserved
+
     def test_too_long(self):
         result = ParameterValidator.validate_filename("a" * 256)
         assert not result.is_valid
@@ -391,6 +462,24 @@ class TestElementSearchValidation:
         assert sanitized["text"].strip() == "Login"
         assert sanitized["resource_id"].strip() == "com.app:id/btn"
 
+    def test_element_search_plain_fields_fast_path(self):
+        validator = ParameterValidator(SecurityLevel.STRICT)
+        result = validator.validate_element_search(
+            text="Login", class_name="android.widget.Button"
+        )
+        assert result.is_valid is True
+        assert result.sanitized_value == {
+            "text": "Login", "class_name": "android.widget.Button"
+        }
+
+    def test_element_search_falls_back_per_field(self):
+        validator = ParameterValidator(SecurityLevel.STRICT)
+        result = validator.validate_element_search(
+            text="Login", resource_id="id$(reboot)"
+        )
+        assert result.is_valid is False
+        assert result.errors
+
 
 class TestParameterValidator:
     """Test top-level ParameterValidator integration behaviour."""
@@ -402,6 +491,10 @@ class TestParameterValidator:
         moderate_validator = ParameterValidator(SecurityLevel.MODERATE)
         assert moderate_validator.security_level == SecurityLevel.MODERATE
 
+    def test_validator_has_no_instance_dict(self):
+        validator = ParameterValidator(SecurityLevel.MODERATE)
+        assert not hasattr(validator, "__dict__")
+
     def test_text_input_validation_integration(self):
         validator = ParameterValidator(SecurityLevel.STRICT)
 
@@ -462,6 +555,20 @@ class TestValidationHelpers:
 
         assert mock_logger.warning.called or mock_logger.error.called
 
+    def test_log_validation_attempt_formats_lazily(self, caplog):
+        logger = logging.getLogger("test_validation.lazy")
+        result = ValidationResult(True, "x", [], ["odd input"])
+
+        with caplog.at_level(logging.WARNING, logger=logger.name):
+            log_validation_attempt("op", {"text": "x"}, result, logger)
+        assert caplog.records == []
+
+        with caplog.at_level(logging.INFO, logger=logger.name):
+            log_validation_attempt("op", {"text": "x"}, result, logger)
+        assert caplog.records[-1].getMessage() == (
+            "Validation warnings for op: ['odd input']. Parameters: {'text': 'x'}"
+        )
+
 
 class TestSecurityLevelBehavior:
     """Test different security level behaviors."""